@@ -0,0 +1,43 @@
+"""soft-delete cars & track background purges of their receipts
+
+Revision ID: 3f6c2a9d8e41
+Revises: d78017c30ce8
+Create Date: 2026-10-19 10:12:31.514208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6c2a9d8e41'
+down_revision: Union[str, Sequence[str], None] = 'd78017c30ce8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cars', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_cars_deleted_user_id', 'cars', ['user_id'], unique=False,
+                    postgresql_where=sa.text('deleted_at IS NOT NULL'), sqlite_where=sa.text('deleted_at IS NOT NULL'))
+    op.create_index(op.f('ix_fuel_receipts_car_id'), 'fuel_receipts', ['car_id'], unique=False)
+    op.create_table('car_purges',
+    sa.Column('car_id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('purged_receipts', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('car_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('car_purges')
+    op.drop_index(op.f('ix_fuel_receipts_car_id'), table_name='fuel_receipts')
+    op.drop_index('ix_cars_deleted_user_id', table_name='cars')
+    op.drop_column('cars', 'deleted_at')
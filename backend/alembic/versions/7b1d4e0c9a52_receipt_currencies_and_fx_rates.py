@@ -0,0 +1,51 @@
+"""receipt currencies, normalized amounts & fx rates table
+
+Revision ID: 7b1d4e0c9a52
+Revises: 3f6c2a9d8e41
+Create Date: 2026-10-19 15:02:47.118630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b1d4e0c9a52'
+down_revision: Union[str, Sequence[str], None] = '3f6c2a9d8e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('fx_rates',
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('rate', sa.Numeric(), nullable=False),
+    sa.PrimaryKeyConstraint('currency', 'date')
+    )
+    op.add_column('fuel_receipts', sa.Column('currency', sa.String(length=3), nullable=True))
+    op.add_column('fuel_receipts', sa.Column('amount_paid_normalized', sa.Numeric(), nullable=True))
+    op.add_column('fuel_receipts', sa.Column('advertised_price_normalized', sa.Numeric(), nullable=True))
+
+    # Receipts so far were all entered in their owner's currency
+    op.execute("""
+        UPDATE fuel_receipts
+        SET currency = (SELECT users.currency FROM users WHERE users.id = fuel_receipts.user_id),
+            amount_paid_normalized = amount_paid,
+            advertised_price_normalized = advertised_price
+    """)
+
+    op.alter_column('fuel_receipts', 'currency', nullable=False)
+    op.alter_column('fuel_receipts', 'amount_paid_normalized', nullable=False)
+    op.alter_column('fuel_receipts', 'advertised_price_normalized', nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('fuel_receipts', 'advertised_price_normalized')
+    op.drop_column('fuel_receipts', 'amount_paid_normalized')
+    op.drop_column('fuel_receipts', 'currency')
+    op.drop_table('fx_rates')
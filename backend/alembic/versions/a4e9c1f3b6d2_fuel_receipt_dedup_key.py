@@ -0,0 +1,59 @@
+"""fuel receipt dedup key with a unique index
+
+Revision ID: a4e9c1f3b6d2
+Revises: 7b1d4e0c9a52
+Create Date: 2026-10-19 16:40:05.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e9c1f3b6d2'
+down_revision: Union[str, Sequence[str], None] = '7b1d4e0c9a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _quantized(column: str) -> str:
+    """SQL for str(Decimal(column).quantize(Decimal("0.01"))), which rounds half to even unlike Postgres' round()."""
+    cents = f'({column} * 100)'
+    rounded = (f'CASE WHEN {cents} - floor({cents}) > 0.5 OR ({cents} - floor({cents}) = 0.5 AND mod(floor({cents}), 2) <> 0)'
+               f' THEN floor({cents}) + 1 ELSE floor({cents}) END')
+    return f'round({rounded} / 100, 2)::text'
+
+
+# Frozen copy of app.api.fuel_receipts._dedup_key as of this revision, in SQL:
+# sha256 of "user_id|car_id|date|amount_paid|odometer", amounts to the cent
+DEDUP_KEY = (
+    "encode(sha256(convert_to(concat_ws('|', user_id, car_id, to_char(date, 'YYYY-MM-DD'), "
+    f"{_quantized('amount_paid')}, {_quantized('odometer')}), 'UTF8')), 'hex')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('fuel_receipts', sa.Column('dedup_key', sa.String(), nullable=True))
+
+    # One statement rather than a round trip per row. Existing duplicates keep a
+    # NULL key (the oldest copy gets it) so the index can be built; they can be
+    # reviewed with `SELECT ... WHERE dedup_key IS NULL`
+    op.execute(f'''
+        UPDATE fuel_receipts SET dedup_key = keyed.dedup_key
+        FROM (
+            SELECT id, dedup_key, row_number() OVER (PARTITION BY dedup_key ORDER BY created_at, id) AS copy
+            FROM (SELECT id, created_at, {DEDUP_KEY} AS dedup_key FROM fuel_receipts) AS receipts
+        ) AS keyed
+        WHERE fuel_receipts.id = keyed.id AND keyed.copy = 1
+    ''')
+
+    op.create_index(op.f('ix_fuel_receipts_dedup_key'), 'fuel_receipts', ['dedup_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_fuel_receipts_dedup_key'), table_name='fuel_receipts')
+    op.drop_column('fuel_receipts', 'dedup_key')
@@ -0,0 +1,119 @@
+"""native uuid ids and hash-partitioned fuel receipts
+
+Revision ID: c5d8e2a7f190
+Revises: a4e9c1f3b6d2
+Create Date: 2026-10-19 18:12:47.330591
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d8e2a7f190'
+down_revision: Union[str, Sequence[str], None] = 'a4e9c1f3b6d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of app.models.fuel_receipt.PARTITIONS as of this revision
+PARTITIONS = 16
+
+# Id columns outside fuel_receipts, which is rebuilt instead of altered
+ID_COLUMNS = [('users', 'id'), ('cars', 'id'), ('cars', 'user_id'), ('car_purges', 'car_id'), ('car_purges', 'user_id')]
+
+RECEIPT_COLUMNS = 'id, date, amount_paid, volume_purchased, advertised_price, odometer, currency, amount_paid_normalized, advertised_price_normalized, user_id, car_id, dedup_key, created_at, updated_at'
+
+
+def _receipt_columns(id_type):
+    return [
+        sa.Column('id', id_type, nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('amount_paid', sa.Numeric(), nullable=False),
+        sa.Column('volume_purchased', sa.Numeric(), nullable=False),
+        sa.Column('advertised_price', sa.Numeric(), nullable=False),
+        sa.Column('odometer', sa.Numeric(), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=False),
+        sa.Column('amount_paid_normalized', sa.Numeric(), nullable=False),
+        sa.Column('advertised_price_normalized', sa.Numeric(), nullable=False),
+        sa.Column('user_id', id_type, nullable=False),
+        sa.Column('car_id', id_type, nullable=False),
+        sa.Column('dedup_key', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    ]
+
+
+def _alter_id_columns(type_, cast: str):
+    # Foreign keys can't span the type change, so they're dropped and recreated around it
+    op.drop_constraint('cars_user_id_fkey', 'cars', type_='foreignkey')
+    op.drop_constraint('car_purges_user_id_fkey', 'car_purges', type_='foreignkey')
+    for table, column in ID_COLUMNS:
+        op.alter_column(table, column, type_=type_, postgresql_using=f'{column}::{cast}')
+    op.create_foreign_key('cars_user_id_fkey', 'cars', 'users', ['user_id'], ['id'])
+    op.create_foreign_key('car_purges_user_id_fkey', 'car_purges', 'users', ['user_id'], ['id'])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres can't partition an existing table, so fuel_receipts is copied into a new one.
+    # The copy holds an exclusive lock on the old table: run it in a maintenance window on large installs.
+    op.rename_table('fuel_receipts', 'fuel_receipts_unpartitioned')
+    op.execute('ALTER TABLE fuel_receipts_unpartitioned RENAME CONSTRAINT fuel_receipts_pkey TO fuel_receipts_unpartitioned_pkey')
+    op.drop_constraint('fuel_receipts_user_id_fkey', 'fuel_receipts_unpartitioned', type_='foreignkey')
+    op.drop_constraint('fuel_receipts_car_id_fkey', 'fuel_receipts_unpartitioned', type_='foreignkey')
+    op.drop_index('ix_fuel_receipts_dedup_key', table_name='fuel_receipts_unpartitioned')
+    op.drop_index('ix_fuel_receipts_car_id', table_name='fuel_receipts_unpartitioned')
+
+    _alter_id_columns(sa.Uuid(), 'uuid')
+
+    op.create_table('fuel_receipts',
+    *_receipt_columns(sa.Uuid()),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['car_id'], ['cars.id'], ),
+    sa.PrimaryKeyConstraint('id', 'user_id'),
+    postgresql_partition_by='HASH (user_id)'
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(f'CREATE TABLE fuel_receipts_p{remainder} PARTITION OF fuel_receipts FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})')
+
+    # Existing rows keep their random uuid4 ids; new rows get time-ordered uuid7 ids from the app
+    op.execute(f'''
+        INSERT INTO fuel_receipts ({RECEIPT_COLUMNS})
+        SELECT id::uuid, date, amount_paid, volume_purchased, advertised_price, odometer, currency, amount_paid_normalized,
+               advertised_price_normalized, user_id::uuid, car_id::uuid, dedup_key, created_at, updated_at
+        FROM fuel_receipts_unpartitioned
+    ''')
+    op.drop_table('fuel_receipts_unpartitioned')
+
+    # Built after the copy, which is much faster than maintaining them row by row
+    op.create_index(op.f('ix_fuel_receipts_car_id'), 'fuel_receipts', ['car_id'], unique=False)
+    op.create_index('ix_fuel_receipts_user_id_dedup_key', 'fuel_receipts', ['user_id', 'dedup_key'], unique=True)
+    op.create_index('ix_fuel_receipts_user_id_date', 'fuel_receipts', ['user_id', 'date'], unique=False)
+    op.execute('ANALYZE fuel_receipts')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table('fuel_receipts_unpartitioned',
+    *_receipt_columns(sa.String()),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(f'''
+        INSERT INTO fuel_receipts_unpartitioned ({RECEIPT_COLUMNS})
+        SELECT id::text, date, amount_paid, volume_purchased, advertised_price, odometer, currency, amount_paid_normalized,
+               advertised_price_normalized, user_id::text, car_id::text, dedup_key, created_at, updated_at
+        FROM fuel_receipts
+    ''')
+    # Drops the partitions and their indexes along with it
+    op.drop_table('fuel_receipts')
+    op.rename_table('fuel_receipts_unpartitioned', 'fuel_receipts')
+    op.execute('ALTER TABLE fuel_receipts RENAME CONSTRAINT fuel_receipts_unpartitioned_pkey TO fuel_receipts_pkey')
+
+    _alter_id_columns(sa.String(), 'text')
+
+    op.create_foreign_key('fuel_receipts_user_id_fkey', 'fuel_receipts', 'users', ['user_id'], ['id'])
+    op.create_foreign_key('fuel_receipts_car_id_fkey', 'fuel_receipts', 'cars', ['car_id'], ['id'])
+    op.create_index(op.f('ix_fuel_receipts_car_id'), 'fuel_receipts', ['car_id'], unique=False)
+    op.create_index(op.f('ix_fuel_receipts_dedup_key'), 'fuel_receipts', ['dedup_key'], unique=True)
@@ -0,0 +1,32 @@
+"""car purge retry backoff
+
+Revision ID: e2b7f4a9c315
+Revises: c5d8e2a7f190
+Create Date: 2026-10-19 21:05:18.264019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7f4a9c315'
+down_revision: Union[str, Sequence[str], None] = 'c5d8e2a7f190'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('car_purges', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('car_purges', sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    # Pending purges already queued keep their order
+    op.execute('UPDATE car_purges SET next_attempt_at = created_at WHERE created_at IS NOT NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('car_purges', 'next_attempt_at')
+    op.drop_column('car_purges', 'attempts')
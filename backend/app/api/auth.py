@@ -2,17 +2,21 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.models import user
 from app.api import deps
-from passlib.context import CryptContext
 from app.core import security
+from app.db import routing
 from app.schemas import response_schemas, request_schemas
+from functools import lru_cache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 router = APIRouter()
@@ -35,6 +39,8 @@ def register(credentials: request_schemas.RegisterCredentials, db: Session = Dep
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    # The request had no token yet, so bind read-your-writes to the new account
+    routing.set_writer(new_user.email)
 
     access_token = security.create_access_token(data={"sub": new_user.email})
 
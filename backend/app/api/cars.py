@@ -1,14 +1,18 @@
 from fastapi import APIRouter, Depends, status, HTTPException
 from app.schemas import response_schemas, request_schemas
 from app.api import deps
+from app.core import events, purge
+from app.core.idempotency import IdempotentRoute
 from app.models.car import Car
+from app.models.car_purge import CarPurge
 from app.models.user import User
 from app.models.fuel_receipt import FuelReceipt
 from sqlalchemy.orm import Session
 from typing import List
 from sqlalchemy import desc
+from sqlalchemy.sql import func
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
 
 @router.post("", response_model=response_schemas.CarSchema)
 def add_car(new_car_details: request_schemas.CreateCar, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
@@ -34,19 +38,21 @@ def add_car(new_car_details: request_schemas.CreateCar, current_user: User = Dep
     db.refresh(new_car)
 
     car_model = response_schemas.CarSchema.model_validate(new_car)
+    events.publish(current_user.id, "car.created", car_model.model_dump(mode="json", by_alias=True))
 
     return car_model
 
 @router.get("", response_model=List[response_schemas.CarSchema])
 def get_all_cars(current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
-    cars_for_user = db.query(Car).filter(Car.user_id == current_user.id).order_by(desc(Car.is_default), desc(Car.updated_at)).all()
+    cars_for_user = db.query(Car).filter(Car.user_id == current_user.id, Car.deleted_at.is_(None)).order_by(desc(Car.is_default), desc(Car.updated_at)).all()
     return [response_schemas.CarSchema.model_validate(car) for car in cars_for_user]
 
 @router.delete("/{car_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_car(car_id: str, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
+def delete_car(car_id: request_schemas.Id, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
     car_to_delete = db.query(Car).filter(
         Car.id == car_id,
-        Car.user_id == current_user.id
+        Car.user_id == current_user.id,
+        Car.deleted_at.is_(None)
     ).first()
 
     if not car_to_delete:
@@ -55,20 +61,48 @@ def delete_car(car_id: str, current_user: User = Depends(deps.get_current_user),
             detail="Car not found or you don't have permission to delete it."
         )
     
-    db.query(FuelReceipt).filter(FuelReceipt.user_id == current_user.id, FuelReceipt.car_id == car_id).delete()
-
-    db.delete(car_to_delete)
+    # Only tombstone the car here; its receipts are hidden from now on and
+    # removed in batches by the purge worker (app/core/purge.py)
+    car_to_delete.deleted_at = func.now()
+    car_to_delete.is_default = False
+    db.add(CarPurge(car_id=car_id, user_id=current_user.id, purged_receipts=0))
     db.commit()
+    purge.wake()
+    events.publish(current_user.id, "car.deleted", {"id": car_id})
 
     return
 
+@router.get("/{car_id}/purge", response_model=response_schemas.CarPurgeSchema)
+def get_car_purge(car_id: request_schemas.Id, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
+    car_purge = db.query(CarPurge).filter(
+        CarPurge.car_id == car_id,
+        CarPurge.user_id == current_user.id
+    ).first()
+
+    if not car_purge:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No deletion found for this car."
+        )
+
+    remaining_receipts = 0 if car_purge.completed_at else db.query(FuelReceipt).filter(FuelReceipt.user_id == current_user.id, FuelReceipt.car_id == car_id).count()
+
+    return response_schemas.CarPurgeSchema(
+        car_id=car_purge.car_id,
+        purged_receipts=car_purge.purged_receipts,
+        remaining_receipts=remaining_receipts,
+        created_at=car_purge.created_at,
+        completed_at=car_purge.completed_at
+    )
+
 @router.post("/{car_id}/set-default", response_model=response_schemas.CarSchema)
-def set_car_as_default(car_id: str, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
+def set_car_as_default(car_id: request_schemas.Id, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
     db.query(Car).filter(Car.user_id == current_user.id, Car.is_default == True).update({"is_default": False})
 
     car_to_set_as_default = db.query(Car).filter(
         Car.id == car_id,
-        Car.user_id == current_user.id
+        Car.user_id == current_user.id,
+        Car.deleted_at.is_(None)
     ).first()
 
     if not car_to_set_as_default:
@@ -83,14 +117,16 @@ def set_car_as_default(car_id: str, current_user: User = Depends(deps.get_curren
     db.refresh(car_to_set_as_default)
 
     car_model = response_schemas.CarSchema.model_validate(car_to_set_as_default)
+    events.publish(current_user.id, "car.updated", car_model.model_dump(mode="json", by_alias=True))
 
     return car_model
 
 @router.put("/{car_id}", response_model=response_schemas.CarSchema)
-def update_car(new_car_details: request_schemas.UpdateCar, car_id: str, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
+def update_car(new_car_details: request_schemas.UpdateCar, car_id: request_schemas.Id, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
     car_to_update = db.query(Car).filter(
         Car.id == car_id,
-        Car.user_id == current_user.id
+        Car.user_id == current_user.id,
+        Car.deleted_at.is_(None)
     ).first()
 
     if not car_to_update:
@@ -106,5 +142,6 @@ def update_car(new_car_details: request_schemas.UpdateCar, car_id: str, current_
     db.refresh(car_to_update)
 
     car_model = response_schemas.CarSchema.model_validate(car_to_update)
+    events.publish(current_user.id, "car.updated", car_model.model_dump(mode="json", by_alias=True))
 
     return car_model
\ No newline at end of file
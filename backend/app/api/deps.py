@@ -1,15 +1,17 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from app.core import security
-from app.db.session import SessionLocal
+from app.db import routing
+from app.db.session import SessionLocal, ReadSessionLocal
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-def get_db():
-    db = SessionLocal()
+def get_db(request: Request):
+    # Reads go to the replica unless the client wrote within READ_YOUR_WRITES_SECONDS
+    db = ReadSessionLocal() if routing.use_replica(request) else SessionLocal()
     try:
         yield db
     finally:
@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.api import deps
+from app.core import events, lifecycle, security
+from app.core.config import get_settings
+from app.db.session import ReadSessionLocal
+from app.models.user import User
+
+router = APIRouter()
+
+@router.post("/ticket")
+def create_ticket(current_user: User = Depends(deps.get_current_user)):
+    """
+    A short-lived ticket for opening the event stream. EventSource can't send
+    headers, so whatever authenticates it ends up in the URL (and in access
+    logs, proxy logs and browser history); the access token must not.
+
+    A ticket opens one connection per broker: with several API workers and no
+    EVENTS_REDIS_URL each worker keeps its own claims, so a leaked ticket can
+    open one stream on every worker until it expires. `crossWorker` tells the
+    client whether the stream will see events published by every worker (OCR
+    job results included) or only by the one it lands on.
+    """
+    return {
+        "ticket": security.create_stream_ticket(current_user.email),
+        "expiresIn": get_settings().EVENTS_TICKET_SECONDS,
+        "crossWorker": events.reaches_every_worker(),
+    }
+
+def _authenticate(ticket: str) -> str:
+    payload = security.verify_stream_ticket(ticket)
+    if payload is None or not payload.get("sub"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired ticket",
+        )
+    if not events.get_broker().claim_ticket(payload["jti"], get_settings().EVENTS_TICKET_SECONDS):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Ticket already used",
+        )
+
+    # A short-lived session: the stream itself may stay open for hours
+    db = ReadSessionLocal()
+    try:
+        user = db.query(User).filter(User.email == payload["sub"]).first()
+    finally:
+        db.close()
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return user.id
+
+@router.get("")
+async def stream_events(request: Request, ticket: str = Query(...)):
+    """
+    Server-sent events for the current user: ocr.completed / ocr.failed for
+    upload jobs, and car.* / receipt.* whenever their data changes. Opened
+    with a ticket from POST /ticket; reconnecting takes a new one.
+    """
+    user_id = await run_in_threadpool(_authenticate, ticket)
+    heartbeat_seconds = get_settings().EVENTS_HEARTBEAT_SECONDS
+    broker = events.get_broker()
+    subscription = broker.subscribe(user_id)
+
+    async def stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    # Closing on drain lets the client reconnect to a worker that is staying up
+                    if lifecycle.is_draining():
+                        return
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+        finally:
+            broker.unsubscribe(user_id, subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,91 +1,119 @@
-from fastapi import APIRouter, Depends, status, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, status, HTTPException, Request, UploadFile, File
 from app.schemas import response_schemas, request_schemas
 from app.api import deps
 from app.models.car import Car
 from app.models.fuel_receipt import FuelReceipt
 from app.models.user import User
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List
-from sqlalchemy import desc
-import easyocr
-import shutil
-import os
-
-router = APIRouter()
-reader = easyocr.Reader(['en'])
-
-def reconstruct_receipt_text(easyocr_results, y_tolerance=10):
-    """
-    Reconstructs receipt text preserving structure using bounding box coordinates.
-    
-    y_tolerance: Max vertical difference (pixels) considered for the same line.
-    """
-    
-    # Extract coordinates and text from the full EasyOCR result
-    data = []
-    for (bbox, text, confidence) in easyocr_results:
-        # Get the top-left corner (x1, y1)
-        x1 = bbox[0][0]
-        y1 = bbox[0][1]
-        data.append({'x': x1, 'y': y1, 'text': text})
-    
-    # Sort all items primarily by Y, then by X
-    data.sort(key=lambda item: (item['y'], item['x']))
-
-    structured_text_lines = []
-    current_line = []
-    
-    if not data:
-        return ""
-
-    # Start with the first item's Y-coordinate
-    current_y = data[0]['y']
-
-    for item in data:
-        # Check if the item is on a new line (y-coordinate change > tolerance)
-        if item['y'] > current_y + y_tolerance:
-            # New line detected:
-            # 1. Sort the previous line's elements by X
-            current_line.sort(key=lambda x: x['x'])
-            
-            # 2. Join words with a single space and add the completed line
-            line_text = " ".join([elem['text'] for elem in current_line])
-            structured_text_lines.append(line_text)
-            
-            # 3. Start a new line
-            current_line = []
-            current_y = item['y']
-            
-        current_line.append(item)
-
-    # Process the last line (if any)
-    if current_line:
-        current_line.sort(key=lambda x: x['x'])
-        line_text = " ".join([elem['text'] for elem in current_line])
-        structured_text_lines.append(line_text)
-
-    # Join all lines with a newline character
-    return "\n".join(structured_text_lines)
+from sqlalchemy import desc, func, select
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import hashlib
+import uuid
+from decimal import Decimal
+from app.core import events, fx, rate_limit
+from app.core.idempotency import IdempotentRoute
+from app.core.config import get_settings
+from app.ocr import client as ocr_client
+from app.ocr import engine as ocr_engine
+
+router = APIRouter(route_class=IdempotentRoute)
+
+def visible_receipts(db: Session, user_id: str):
+    """The user's receipts, minus those of deleted cars that are still being purged."""
+    deleted_cars = select(Car.id).where(Car.user_id == user_id, Car.deleted_at.isnot(None))
+    return db.query(FuelReceipt).filter(FuelReceipt.user_id == user_id, FuelReceipt.car_id.not_in(deleted_cars))
+
+def _check_car(db: Session, car_id: str, user_id: str):
+    """404s unless `car_id` is one of the user's cars that isn't deleted."""
+    # FOR SHARE holds off a concurrent delete of the car until the receipt
+    # commits, so the purge worker is sure to see (and remove) it
+    car = db.query(Car).filter(Car.id == car_id, Car.user_id == user_id, Car.deleted_at.is_(None)).with_for_update(read=True).first()
+    if not car:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Car not found or you don't have permission to add receipts to it."
+        )
+
+async def _read_receipt(image: bytes, filename: str | None) -> str:
+    # Hand off to the OCR worker tier when one is configured, otherwise run
+    # inference here in the threadpool so it doesn't block the event loop
+    if get_settings().OCR_SERVICE_URL:
+        return await ocr_client.read_receipt(image, filename)
+    return await run_in_threadpool(ocr_engine.read_receipt, image)
+
+def _normalize(db: Session, fuel_receipt: FuelReceipt, currency: str):
+    """Materializes the receipt's amounts in `currency` (its owner's), so spend totals are a plain SUM."""
+    try:
+        rate = fx.conversion_rate(db, fuel_receipt.currency, currency, fuel_receipt.date)
+    except LookupError as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error))
+
+    fuel_receipt.amount_paid_normalized = round(Decimal(str(fuel_receipt.amount_paid)) * rate, 2)
+    fuel_receipt.advertised_price_normalized = round(Decimal(str(fuel_receipt.advertised_price)) * rate, 3)
+
+def _dedup_key(fuel_receipt: FuelReceipt) -> str:
+    # Normalized so 50, 50.0 and "50.00" all produce the same key
+    parts = [
+        fuel_receipt.user_id,
+        fuel_receipt.car_id,
+        fuel_receipt.date.isoformat(),
+        str(Decimal(str(fuel_receipt.amount_paid)).quantize(Decimal("0.01"))),
+        str(Decimal(str(fuel_receipt.odometer)).quantize(Decimal("0.01"))),
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+def _commit_unless_duplicate(db: Session):
+    try:
+        db.commit()
+    except IntegrityError as error:
+        db.rollback()
+        if "dedup_key" in str(error.orig):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="This receipt has already been added.")
+        raise
+
+# Keeps a reference to running OCR jobs so they aren't garbage collected mid-flight
+_ocr_jobs = set()
+
+async def _run_ocr_job(job_id: str, user_id: str, image: bytes, filename: str | None, slot: str | None):
+    try:
+        extracted_text_structured = await _read_receipt(image, filename)
+    except Exception as error:
+        detail = error.detail if isinstance(error, HTTPException) else "OCR failed"
+        await run_in_threadpool(events.publish, user_id, "ocr.failed", {"jobId": job_id, "detail": detail})
+        return
+    finally:
+        # Held until the OCR is done, so jobs count against RATE_LIMIT_OCR_CONCURRENCY like /upload does
+        await rate_limit.release_ocr_slot(slot)
+
+    await run_in_threadpool(events.publish, user_id, "ocr.completed", {"jobId": job_id, "text": extracted_text_structured})
 
 @router.post("/upload")
 async def perform_ocr(file: UploadFile = File(...)):
-    # 1. Save the uploaded file temporarily
-    temp_path = f"temp_{file.filename}"
-    with open(temp_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
-    # 2. Run EasyOCR - 'result' now contains text AND coordinates
-    result = reader.readtext(temp_path)
-    os.remove(temp_path)
-
-    # 3. Use the reconstruction function to format the text
-    extracted_text_structured = reconstruct_receipt_text(result)
-    
-    # 4. Return the single, structured text string
+    image = await file.read()
+    extracted_text_structured = await _read_receipt(image, file.filename)
+
     return {"text": extracted_text_structured}
 
+@router.post("/upload/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def start_ocr_job(request: Request, file: UploadFile = File(...), current_user: User = Depends(deps.get_current_user)):
+    """Starts OCR in the background; the result arrives as an ocr.completed event on /api/events."""
+    image = await file.read()
+    job_id = str(uuid.uuid4())
+
+    slot = rate_limit.take_ocr_slot(request)
+    job = asyncio.create_task(_run_ocr_job(job_id, current_user.id, image, file.filename, slot))
+    _ocr_jobs.add(job)
+    job.add_done_callback(_ocr_jobs.discard)
+
+    return {"jobId": job_id}
+
 @router.post("", response_model=response_schemas.FuelReceiptSchema)
 def add_fuel_receipt(new_fuel_receipt_details: request_schemas.CreateFuelReceipt, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
+    _check_car(db, new_fuel_receipt_details.carId, current_user.id)
+
     new_fuel_receipt = FuelReceipt(
         date=new_fuel_receipt_details.date,
         amount_paid=new_fuel_receipt_details.amountPaid,
@@ -93,20 +121,24 @@ def add_fuel_receipt(new_fuel_receipt_details: request_schemas.CreateFuelReceipt
         advertised_price=new_fuel_receipt_details.advertisedPrice,
         odometer=new_fuel_receipt_details.odometer,
         user_id=current_user.id,
-        car_id=new_fuel_receipt_details.carId
+        car_id=new_fuel_receipt_details.carId,
+        currency=new_fuel_receipt_details.currency or current_user.currency
     )
+    _normalize(db, new_fuel_receipt, current_user.currency)
+    new_fuel_receipt.dedup_key = _dedup_key(new_fuel_receipt)
 
     db.add(new_fuel_receipt)
-    db.commit()
+    _commit_unless_duplicate(db)
     db.refresh(new_fuel_receipt)
 
     fuel_receipt_model = response_schemas.FuelReceiptSchema.model_validate(new_fuel_receipt)
+    events.publish(current_user.id, "receipt.created", fuel_receipt_model.model_dump(mode="json", by_alias=True))
 
     return fuel_receipt_model
 
 @router.get("", response_model=List[response_schemas.FuelReceiptSchema])
-def get_all_fuel_receipts(car_id: str | None = None, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
-    query = db.query(FuelReceipt).filter(FuelReceipt.user_id == current_user.id)
+def get_all_fuel_receipts(car_id: request_schemas.Id | None = None, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
+    query = visible_receipts(db, current_user.id)
 
     if car_id:
         query = query.filter(FuelReceipt.car_id == car_id)
@@ -114,12 +146,29 @@ def get_all_fuel_receipts(car_id: str | None = None, current_user: User = Depend
     fuel_receipts_for_user = query.order_by(desc(FuelReceipt.date)).all()
     return [response_schemas.FuelReceiptSchema.model_validate(fuel_receipt) for fuel_receipt in fuel_receipts_for_user]
 
+@router.get("/summary", response_model=response_schemas.FuelReceiptSummarySchema)
+def get_fuel_receipt_summary(car_id: request_schemas.Id | None = None, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
+    query = visible_receipts(db, current_user.id)
+
+    if car_id:
+        query = query.filter(FuelReceipt.car_id == car_id)
+
+    receipts, total_spent, total_volume = query.with_entities(
+        func.count(FuelReceipt.id),
+        func.coalesce(func.sum(FuelReceipt.amount_paid_normalized), 0),
+        func.coalesce(func.sum(FuelReceipt.volume_purchased), 0)
+    ).one()
+
+    return response_schemas.FuelReceiptSummarySchema(
+        currency=current_user.currency,
+        receipts=receipts,
+        total_spent=total_spent,
+        total_volume=total_volume
+    )
+
 @router.delete("/{fuel_receipt_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_fuel_receipt(fuel_receipt_id: str, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
-    fuel_receipt_to_delete = db.query(FuelReceipt).filter(
-        FuelReceipt.id == fuel_receipt_id,
-        FuelReceipt.user_id == current_user.id
-    ).first()
+def delete_fuel_receipt(fuel_receipt_id: request_schemas.Id, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
+    fuel_receipt_to_delete = visible_receipts(db, current_user.id).filter(FuelReceipt.id == fuel_receipt_id).first()
 
     if not fuel_receipt_to_delete:
         raise HTTPException(
@@ -131,15 +180,13 @@ def delete_fuel_receipt(fuel_receipt_id: str, current_user: User = Depends(deps.
 
     db.delete(fuel_receipt_to_delete)
     db.commit()
+    events.publish(current_user.id, "receipt.deleted", {"id": fuel_receipt_id})
 
     return
 
 @router.put("/{fuel_receipt_id}", response_model=response_schemas.FuelReceiptSchema)
-def update_fuel_receipt(new_fuel_receipt_details: request_schemas.UpdateFuelReceipt, fuel_receipt_id: str, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
-    fuel_receipt_to_update = db.query(FuelReceipt).filter(
-        FuelReceipt.id == fuel_receipt_id,
-        FuelReceipt.user_id == current_user.id
-    ).first()
+def update_fuel_receipt(new_fuel_receipt_details: request_schemas.UpdateFuelReceipt, fuel_receipt_id: request_schemas.Id, current_user: User = Depends(deps.get_current_user), db: Session = Depends(deps.get_db)):
+    fuel_receipt_to_update = visible_receipts(db, current_user.id).filter(FuelReceipt.id == fuel_receipt_id).first()
 
     if not fuel_receipt_to_update:
         raise HTTPException(
@@ -147,12 +194,18 @@ def update_fuel_receipt(new_fuel_receipt_details: request_schemas.UpdateFuelRece
             detail="Fuel Receipt not found or you don't have permission to update it."
         )
 
+    if new_fuel_receipt_details.carId is not None:
+        _check_car(db, new_fuel_receipt_details.carId, current_user.id)
+
     for field, value in new_fuel_receipt_details.model_dump(exclude_unset=True, by_alias=True).items():
         setattr(fuel_receipt_to_update, field, value)
+    _normalize(db, fuel_receipt_to_update, current_user.currency)
+    fuel_receipt_to_update.dedup_key = _dedup_key(fuel_receipt_to_update)
 
-    db.commit()
+    _commit_unless_duplicate(db)
     db.refresh(fuel_receipt_to_update)
 
     fuel_receipt_model = response_schemas.FuelReceiptSchema.model_validate(fuel_receipt_to_update)
+    events.publish(current_user.id, "receipt.updated", fuel_receipt_model.model_dump(mode="json", by_alias=True))
 
     return fuel_receipt_model
@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import JSONResponse
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app.api import deps
+from app.core import lifecycle, rate_limit
+from app.core.config import get_settings
+from app.db import session
+from app.ocr import client as ocr_client
 
 router = APIRouter()
 
@@ -19,4 +26,53 @@ def health_check(db: Session = Depends(deps.get_db)):
     return {
         "status": "ok",
         "timestamp": datetime.now(timezone.utc).isoformat()
-    }
\ No newline at end of file
+    }
+
+def _check_database(engine) -> str:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except Exception:
+        return "unavailable"
+    return "ready"
+
+@router.get("/ready")
+def readiness_check():
+    settings = get_settings()
+    tiers = {"api": "draining" if lifecycle.is_draining() else "ready"}
+
+    tiers["database"] = _check_database(session.get_engine())
+    if settings.REPLICA_DATABASE_URL:
+        tiers["database_replica"] = _check_database(session.get_replica_engine())
+
+    if settings.OCR_SERVICE_URL:
+        tiers["ocr"] = "ready" if ocr_client.is_ready() else "unavailable"
+    else:
+        tiers["ocr"] = "in-process"
+
+    ready = all(state in ("ready", "in-process") for state in tiers.values())
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "tiers": tiers,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    )
+
+def require_metrics_token(authorization: str = Header(default="")):
+    # Limiter state is for monitoring only, so it is hidden entirely unless a metrics token is configured
+    token = get_settings().METRICS_TOKEN
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not secrets.compare_digest(authorization.encode(), f"Bearer {token}".encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+@router.get("/rate-limits", dependencies=[Depends(require_metrics_token)])
+def rate_limit_counters():
+    return rate_limit.snapshot()
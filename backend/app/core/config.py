@@ -1,5 +1,8 @@
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
+from typing import Optional
 
 class Settings(BaseSettings):
     DB_HOST: str
@@ -11,11 +14,70 @@ class Settings(BaseSettings):
     ALGORITHM: str = Field(..., env="ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(..., env="ACCESS_TOKEN_EXPIRE_MINUTES")
 
+    # Read replica routing (see app/db/routing.py). Either URL may be a
+    # sqlite:/// file to stand in for Postgres locally.
+    PRIMARY_DATABASE_URL: Optional[str] = None  # overrides the DB_* settings
+    REPLICA_DATABASE_URL: Optional[str] = None  # when unset, reads use the primary
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Rate limiting (see app/core/rate_limit.py)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_REDIS_URL: Optional[str] = None  # share buckets across workers/hosts
+    RATE_LIMIT_OCR_PER_MINUTE: int = 10
+    RATE_LIMIT_AUTH_PER_MINUTE: int = 10
+    RATE_LIMIT_CRUD_PER_MINUTE: int = 300
+    RATE_LIMIT_IP_MULTIPLIER: int = 5
+    RATE_LIMIT_OCR_CONCURRENCY: int = 2
+    METRICS_TOKEN: Optional[str] = None  # bearer token for /api/health/rate-limits, which is off when unset
+
+    # Server-sent events (see app/api/events.py)
+    EVENTS_REDIS_URL: Optional[str] = None  # needed to reach users connected to another worker
+    EVENTS_BUFFER_SIZE: int = 100
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    EVENTS_TICKET_SECONDS: int = 30  # how long a stream ticket from POST /api/events/ticket can be used
+
+    # Idempotency-Key replay for POSTs to cars and fuel receipts (see app/core/idempotency.py)
+    IDEMPOTENCY_REDIS_URL: Optional[str] = None  # share replays across workers/hosts
+    IDEMPOTENCY_TTL_SECONDS: float = 86400.0
+    IDEMPOTENCY_MAX_KEYS: int = 10_000  # per worker, when not using Redis
+
+    # Background purge of deleted cars (see app/core/purge.py)
+    PURGE_BATCH_SIZE: int = 500  # receipts deleted per transaction
+    PURGE_POLL_SECONDS: float = 30.0  # how often idle workers look for purges started elsewhere
+    PURGE_MAX_BACKOFF_SECONDS: float = 3600.0  # cap on the wait before retrying a purge that keeps failing
+
+    # Currency conversion (see app/core/fx.py)
+    FX_BASE_CURRENCY: str = "USD"  # the currency rates in fx_rates are quoted against
+    FX_CACHE_SECONDS: float = 3600.0  # how long a worker keeps a currency's rates before reloading them
+
+    # Production server (see main.py)
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    API_WORKERS: int = 2
+    OCR_HOST: str = "127.0.0.1"
+    OCR_PORT: int = 8001
+    OCR_WORKERS: int = 1
+    OCR_THREADS: int = 1
+    OCR_BACKEND: str = "easyocr"  # "easyocr" or "onnx" (falls back to easyocr if models are missing)
+    OCR_ONNX_DIR: str = "models/onnx"
+    OCR_SERVICE_URL: Optional[str] = None  # when unset, /upload runs OCR in-process
+    OCR_MODE: str = "full"  # "full" recognizes every detected box, "roi" only the total/litres/price/date lines
+    OCR_PREPROCESS: str = ""  # comma separated stages from app/ocr/preprocess.py, e.g. "crop,resize,deskew"
+    OCR_TARGET_TEXT_HEIGHT: int = 32
+    DRAIN_SECONDS: float = 5.0  # time readiness reports "draining" before workers stop
+    GRACEFUL_TIMEOUT: int = 30  # time in-flight requests get to finish after draining
+
     @property
     def DATABASE_URL(self) -> str:
+        if self.PRIMARY_DATABASE_URL:
+            return self.PRIMARY_DATABASE_URL
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
     class Config:
         env_file = ".env"
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    # Built on first use rather than at import, so importing the app (or the
+    # models, for alembic) doesn't read .env or require every variable
+    return Settings()
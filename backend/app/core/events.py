@@ -0,0 +1,156 @@
+import asyncio
+import json
+import logging
+import math
+import threading
+import time
+from functools import lru_cache
+
+from app.core.config import get_settings
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class Subscription:
+    """One SSE connection's bounded buffer. Lives on the event loop that created it."""
+
+    def __init__(self, maxsize: int):
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    def put(self, event: dict):
+        if self.queue.full():
+            # Rather than buffer without bound for a client that can't keep
+            # up, drop the backlog and tell it to refetch everything
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = {"type": "resync", "data": {}}
+        self.queue.put_nowait(event)
+
+
+class LocalBroker:
+    """
+    Fans events out to this process's SSE connections. publish() is safe to
+    call from the sync endpoints running in the threadpool; it may block
+    (RedisBroker), so async code calls it through run_in_threadpool.
+    """
+
+    # Whether events and ticket claims are seen by every worker, not just this process
+    shared = False
+
+    def __init__(self):
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._claimed_tickets: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def claim_ticket(self, ticket_id: str, ttl: float) -> bool:
+        """Marks a stream ticket used; False if it already was. Only this process's claims are seen."""
+        now = time.monotonic()
+        with self._lock:
+            # Expired tickets are rejected before they get here, so their claims can go
+            self._claimed_tickets = {key: expires for key, expires in self._claimed_tickets.items() if expires > now}
+            if ticket_id in self._claimed_tickets:
+                return False
+            self._claimed_tickets[ticket_id] = now + ttl
+            return True
+
+    def subscribe(self, user_id: str) -> Subscription:
+        subscription = Subscription(get_settings().EVENTS_BUFFER_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id: str, subscription: Subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(user_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscribers.pop(user_id, None)
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+    def publish(self, user_id: str, event_type: str, data: dict | None = None):
+        self._deliver(user_id, {"type": event_type, "data": data or {}})
+
+    def _deliver(self, user_id: str, event: dict):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(subscription.put, event)
+
+
+class RedisBroker(LocalBroker):
+    """
+    Relays events through Redis pub/sub so a write handled by one worker
+    reaches the user's SSE connection on any other worker or host. Each
+    process holds a single subscription and fans out locally.
+    """
+
+    CHANNEL = "carcost:events"
+    shared = True
+
+    def __init__(self, url: str):
+        super().__init__()
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("EVENTS_REDIS_URL is set but the `redis` package is not installed")
+
+        self._url = url
+        self._publisher = redis.Redis.from_url(url)
+        self._listener = None
+
+    def subscribe(self, user_id: str) -> Subscription:
+        if self._listener is None:
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return super().subscribe(user_id)
+
+    def claim_ticket(self, ticket_id: str, ttl: float) -> bool:
+        # Blocking, like publish(): only call it from the threadpool
+        return bool(self._publisher.set(f"carcost:events:ticket:{ticket_id}", 1, nx=True, ex=max(1, math.ceil(ttl))))
+
+    def publish(self, user_id: str, event_type: str, data: dict | None = None):
+        message = {"user_id": user_id, "event": {"type": event_type, "data": data or {}}}
+        self._publisher.publish(self.CHANNEL, json.dumps(message))
+
+    async def _listen(self):
+        import redis.asyncio
+
+        while True:
+            try:
+                client = redis.asyncio.from_url(self._url)
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        payload = json.loads(message["data"])
+                        self._deliver(payload["user_id"], payload["event"])
+            except Exception:
+                logger.exception("Lost the Redis event subscription, reconnecting")
+                await asyncio.sleep(1)
+
+
+@lru_cache(maxsize=1)
+def get_broker() -> LocalBroker:
+    url = get_settings().EVENTS_REDIS_URL
+    return RedisBroker(url) if url else LocalBroker()
+
+
+def reaches_every_worker() -> bool:
+    """
+    Whether an event published by any API worker reaches this worker's
+    streams. Counts only this host's API_WORKERS: several hosts behind one
+    load balancer need EVENTS_REDIS_URL as well.
+    """
+    return get_broker().shared or get_settings().API_WORKERS <= 1
+
+
+def publish(user_id: str, event_type: str, data: dict | None = None):
+    try:
+        get_broker().publish(user_id, event_type, data)
+    except Exception:
+        # The write already committed; a lost notification only costs the client a refetch
+        logger.exception("Failed to publish %s event", event_type)
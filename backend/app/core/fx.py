@@ -0,0 +1,121 @@
+"""
+Exchange rates for normalizing receipt amounts into their owner's currency.
+
+Rates live in the fx_rates table, one row per currency and date, quoted as
+units of the currency per one unit of FX_BASE_CURRENCY. There is no live
+rate service: rates are imported from a CSV file with a `date,currency,rate`
+header (re-importing updates existing rows):
+
+    python -m app.core.fx path/to/rates.csv
+
+A receipt uses the latest rate on or before its date, so weekends and
+holidays without a published rate fall back to the previous one.
+"""
+import argparse
+import bisect
+import csv
+import datetime
+import threading
+import time
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.fx_rate import FxRate
+
+
+class RateCache:
+    """Per-process copy of each currency's rate history, reloaded after FX_CACHE_SECONDS."""
+
+    def __init__(self):
+        self._series: dict[str, tuple[float, list[datetime.date], list[Decimal]]] = {}
+        self._lock = threading.Lock()
+
+    def rate(self, db: Session, currency: str, on: datetime.date) -> Decimal | None:
+        settings = get_settings()
+        if currency == settings.FX_BASE_CURRENCY:
+            return Decimal(1)
+
+        with self._lock:
+            series = self._series.get(currency)
+        if series is None or time.monotonic() - series[0] > settings.FX_CACHE_SECONDS:
+            rows = db.execute(select(FxRate.date, FxRate.rate).where(FxRate.currency == currency).order_by(FxRate.date)).all()
+            series = (time.monotonic(), [row.date for row in rows], [Decimal(row.rate) for row in rows])
+            with self._lock:
+                self._series[currency] = series
+
+        _, dates, rates = series
+        index = bisect.bisect_right(dates, on) - 1
+        return rates[index] if index >= 0 else None
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+rates = RateCache()
+
+
+def conversion_rate(db: Session, from_currency: str, to_currency: str, on: datetime.date) -> Decimal:
+    """Multiplier taking an amount in `from_currency` to `to_currency` on `on`. Raises LookupError without a rate."""
+    if from_currency == to_currency:
+        return Decimal(1)
+
+    from_rate = rates.rate(db, from_currency, on)
+    to_rate = rates.rate(db, to_currency, on)
+    for currency, rate in ((from_currency, from_rate), (to_currency, to_rate)):
+        if rate is None:
+            raise LookupError(f"No exchange rate for {currency} on or before {on.isoformat()}")
+    return to_rate / from_rate
+
+
+def import_rates(db: Session, path: str, batch_size: int = 1000) -> int:
+    """Upserts the rates in a `date,currency,rate` CSV file; returns the number of rows read."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    def upsert(batch):
+        statement = insert(FxRate).values(list(batch.values()))
+        db.execute(statement.on_conflict_do_update(index_elements=["currency", "date"], set_={"rate": statement.excluded.rate}))
+
+    count = 0
+    # Keyed so a file repeating a (currency, date) keeps its last value instead of failing the upsert
+    batch = {}
+    with open(path, newline="", encoding="utf-8") as rates_file:
+        for row in csv.DictReader(rates_file):
+            currency = row["currency"].strip().upper()
+            date = datetime.date.fromisoformat(row["date"].strip())
+            batch[(currency, date)] = {"currency": currency, "date": date, "rate": Decimal(row["rate"].strip())}
+            count += 1
+            if len(batch) == batch_size:
+                upsert(batch)
+                batch = {}
+    if batch:
+        upsert(batch)
+
+    db.commit()
+    rates.clear()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV file with a date,currency,rate header")
+    args = parser.parse_args()
+
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        count = import_rates(db, args.path)
+    finally:
+        db.close()
+    print(f"Imported {count} rates (quoted per 1 {get_settings().FX_BASE_CURRENCY})")
+
+
+if __name__ == "__main__":
+    main()
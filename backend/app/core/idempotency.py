@@ -0,0 +1,175 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+from app.core import security
+from app.core.config import get_settings
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Stored while the first request with a key is still running. Expires on
+# its own so a worker that dies mid-request doesn't block the key for the TTL.
+_IN_PROGRESS = {"in_progress": True}
+RESERVATION_SECONDS = 300
+
+
+class MemoryStore:
+    """Per-process LRU of recent responses, capped at IDEMPOTENCY_MAX_KEYS."""
+
+    def __init__(self, max_keys: int):
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._max_keys = max_keys
+        self._lock = threading.Lock()
+
+    async def reserve(self, key: str) -> dict | None:
+        """Claims `key` for a new request; returns the existing entry instead if there is one."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+            self._entries[key] = (now + RESERVATION_SECONDS, _IN_PROGRESS)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_keys:
+                self._entries.popitem(last=False)
+        return None
+
+    async def save(self, key: str, entry: dict, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, entry)
+
+    async def release(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class RedisStore:
+    """Shared by every worker, so a retry landing on another worker still replays."""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio
+        except ImportError:
+            raise RuntimeError("IDEMPOTENCY_REDIS_URL is set but the `redis` package is not installed")
+
+        self._redis = redis.asyncio.from_url(url)
+
+    async def reserve(self, key: str) -> dict | None:
+        key = f"idempotency:{key}"
+        if await self._redis.set(key, json.dumps(_IN_PROGRESS), nx=True, ex=RESERVATION_SECONDS):
+            return None
+        existing = await self._redis.get(key)
+        return json.loads(existing) if existing else None
+
+    async def save(self, key: str, entry: dict, ttl: float):
+        await self._redis.set(f"idempotency:{key}", json.dumps(entry), ex=int(ttl))
+
+    async def release(self, key: str):
+        await self._redis.delete(f"idempotency:{key}")
+
+
+@lru_cache(maxsize=1)
+def get_store():
+    settings = get_settings()
+    url = settings.IDEMPOTENCY_REDIS_URL
+    return RedisStore(url) if url else MemoryStore(settings.IDEMPOTENCY_MAX_KEYS)
+
+
+def _scope(request: Request) -> str:
+    # Keys are only unique per client, so they're namespaced by user (or IP when anonymous)
+    authorization = request.headers.get("Authorization", "")
+    if authorization.startswith("Bearer "):
+        payload = security.verify_access_token(authorization[len("Bearer "):])
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+async def _fingerprint(request: Request) -> str:
+    digest = hashlib.sha256()
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        digest.update(await request.body())
+        return digest.hexdigest()
+
+    # Multipart boundaries are random per request, so hash the parsed parts instead.
+    # Starlette caches the parsed form, so the endpoint reuses it.
+    for name, value in (await request.form()).multi_items():
+        digest.update(name.encode())
+        if isinstance(value, str):
+            digest.update(value.encode())
+        else:
+            digest.update((value.filename or "").encode())
+            digest.update(await value.read())
+            await value.seek(0)
+    return digest.hexdigest()
+
+
+def _error(status_code: int, detail: str) -> JSONResponse:
+    return JSONResponse(status_code=status_code, content={"detail": detail})
+
+
+class IdempotentRoute(APIRoute):
+    """
+    Route class that honors an Idempotency-Key header on POST requests: the
+    first response (unless it is a 5xx or an error raised by the endpoint) is
+    kept for IDEMPOTENCY_TTL_SECONDS and replayed for retries with the same
+    key and body, without running the endpoint again. A retry that arrives
+    while the first request is still running gets a 409, and reusing a key
+    for a different body gets a 422.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def idempotent_handler(request: Request) -> Response:
+            idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+            if request.method != "POST" or not idempotency_key:
+                return await handler(request)
+
+            ttl = get_settings().IDEMPOTENCY_TTL_SECONDS
+            store = get_store()
+            key = f"{_scope(request)}:{request.url.path}:{idempotency_key}"
+            fingerprint = await _fingerprint(request)
+
+            existing = await store.reserve(key)
+            if existing is not None:
+                if existing.get("in_progress"):
+                    return _error(status.HTTP_409_CONFLICT, "A request with this Idempotency-Key is still being processed.")
+                if existing["fingerprint"] != fingerprint:
+                    return _error(status.HTTP_422_UNPROCESSABLE_ENTITY, "This Idempotency-Key was already used for a different request.")
+                return Response(
+                    content=existing["body"].encode("latin-1"),
+                    status_code=existing["status_code"],
+                    media_type=existing["media_type"],
+                    headers={REPLAYED_HEADER: "true"},
+                )
+
+            try:
+                response = await handler(request)
+            except BaseException:
+                await store.release(key)
+                raise
+
+            if response.status_code >= 500 or not hasattr(response, "body"):
+                await store.release(key)
+            else:
+                await store.save(key, {
+                    "fingerprint": fingerprint,
+                    "status_code": response.status_code,
+                    "media_type": response.media_type,
+                    # latin-1 maps bytes to str one to one, so any body survives the JSON round trip
+                    "body": response.body.decode("latin-1"),
+                }, ttl)
+            return response
+
+        return idempotent_handler
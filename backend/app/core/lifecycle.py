@@ -0,0 +1,11 @@
+import multiprocessing
+
+# Allocated in shared memory before the server forks, so the supervisor can
+# flip it once and every worker's readiness check sees the change.
+_draining = multiprocessing.Value("b", 0, lock=False)
+
+def mark_draining():
+    _draining.value = 1
+
+def is_draining() -> bool:
+    return bool(_draining.value)
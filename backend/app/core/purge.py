@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.sql import func
+from starlette.concurrency import run_in_threadpool
+
+from app.core import events
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.car import Car
+from app.models.car_purge import CarPurge
+from app.models.fuel_receipt import FuelReceipt
+
+logger = logging.getLogger("uvicorn.error")
+
+# Set by run_worker() so request threads can wake it up
+_loop: asyncio.AbstractEventLoop | None = None
+_wakeup: asyncio.Event | None = None
+
+
+def purge_next_batch(batch_size: int) -> bool:
+    """
+    Deletes up to `batch_size` receipts of the pending purge that is due
+    first, in its own short transaction, and the car row once none are left.
+    Returns False when there was nothing to purge.
+    """
+    db = SessionLocal()
+    try:
+        # SKIP LOCKED lets every API worker run this loop without two of them taking the same car
+        car_purge = db.execute(
+            select(CarPurge)
+            .where(CarPurge.completed_at.is_(None), CarPurge.next_attempt_at <= datetime.now(timezone.utc))
+            .order_by(CarPurge.next_attempt_at).limit(1).with_for_update(skip_locked=True)
+        ).scalar_one_or_none()
+        if car_purge is None:
+            return False
+
+        car_id, user_id = car_purge.car_id, car_purge.user_id
+        try:
+            # Filtering on user_id too keeps both statements on the owner's partition of fuel_receipts
+            batch = select(FuelReceipt.id).where(FuelReceipt.user_id == user_id, FuelReceipt.car_id == car_id).limit(batch_size)
+            deleted = db.execute(
+                delete(FuelReceipt).where(FuelReceipt.user_id == user_id, FuelReceipt.id.in_(batch)), execution_options={"synchronize_session": False}
+            ).rowcount
+
+            car_purge.purged_receipts += deleted
+            finished = deleted < batch_size
+            if finished:
+                db.execute(delete(Car).where(Car.id == car_id), execution_options={"synchronize_session": False})
+                car_purge.completed_at = func.now()
+            db.commit()
+        except Exception:
+            db.rollback()
+            _retry_later(db, car_id)
+            raise
+    finally:
+        db.close()
+
+    if finished:
+        events.publish(user_id, "car.purged", {"id": car_id})
+    return True
+
+
+def _retry_later(db, car_id: str):
+    """Backs a failed purge off exponentially, from PURGE_POLL_SECONDS up to PURGE_MAX_BACKOFF_SECONDS."""
+    settings = get_settings()
+    car_purge = db.get(CarPurge, car_id)
+    delay = min(settings.PURGE_POLL_SECONDS * 2 ** car_purge.attempts, settings.PURGE_MAX_BACKOFF_SECONDS)
+    car_purge.attempts += 1
+    car_purge.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+    db.commit()
+
+
+def wake():
+    """Makes this process's worker look for purges now instead of at its next poll. Safe to call from any thread."""
+    if _loop is not None and _wakeup is not None:
+        _loop.call_soon_threadsafe(_wakeup.set)
+
+
+async def run_worker():
+    """
+    Runs for the lifetime of an API worker, purging deleted cars one batch
+    at a time so no single transaction holds locks on a long receipt history.
+    """
+    global _loop, _wakeup
+    _loop = asyncio.get_running_loop()
+    _wakeup = asyncio.Event()
+    settings = get_settings()
+
+    try:
+        while True:
+            _wakeup.clear()
+            try:
+                busy = await run_in_threadpool(purge_next_batch, settings.PURGE_BATCH_SIZE)
+            except Exception:
+                logger.exception("Car purge batch failed")
+                busy = False
+
+            if busy:
+                continue
+
+            try:
+                await asyncio.wait_for(_wakeup.wait(), settings.PURGE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        # wake() must not reach a loop that has stopped (the app shutting down, or a test client closing)
+        _loop = _wakeup = None
@@ -0,0 +1,233 @@
+import math
+import os
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from app.core import security
+from app.core.config import get_settings
+
+# Route classes, checked in order. Anything else under /api is "crud".
+ROUTE_CLASSES = [
+    ("ocr", lambda path: path.startswith("/api/fuel-receipts/upload")),
+    ("auth", lambda path: path in ("/api/auth/login", "/api/auth/register")),
+    ("exempt", lambda path: path.startswith("/api/health")),
+]
+
+counters = Counter()
+
+
+def classify(path: str) -> str:
+    for name, matches in ROUTE_CLASSES:
+        if matches(path):
+            return name
+    return "crud"
+
+
+class MemoryBackend:
+    """Per-process buckets. With several workers each one enforces the limit separately."""
+
+    MAX_KEYS = 100_000
+
+    def __init__(self):
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._in_flight: Counter = Counter()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, per_minute: int) -> float:
+        """Takes one token from the bucket; returns 0 if allowed, else seconds until a token is available."""
+        rate = per_minute / 60
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (per_minute, now))
+            tokens = min(per_minute, tokens + (now - updated_at) * rate)
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+
+            if len(self._buckets) > self.MAX_KEYS:
+                self._evict_idle(now)
+
+        return retry_after
+
+    def _evict_idle(self, now: float):
+        # A bucket idle for a minute has refilled, so forgetting it changes nothing
+        self._buckets = {key: value for key, value in self._buckets.items() if now - value[1] < 60}
+
+    async def acquire(self, key: str, limit: int) -> bool:
+        with self._lock:
+            if self._in_flight[key] >= limit:
+                return False
+            self._in_flight[key] += 1
+            return True
+
+    async def release(self, key: str):
+        with self._lock:
+            self._in_flight[key] -= 1
+            if self._in_flight[key] <= 0:
+                del self._in_flight[key]
+
+
+class RedisBackend:
+    """
+    Buckets shared by every worker and host. Anything that speaks the Redis
+    protocol and runs Lua (a local redis container, fakeredis) can stand in.
+    """
+
+    # Uses the server clock so hosts with skewed clocks agree on refill
+    TAKE_SCRIPT = """
+    local per_minute = tonumber(ARGV[1])
+    local rate = per_minute / 60
+    local clock = redis.call("TIME")
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call("HMGET", KEYS[1], "tokens", "ts")
+    local tokens = tonumber(state[1]) or per_minute
+    local updated_at = tonumber(state[2]) or now
+    tokens = math.min(per_minute, tokens + (now - updated_at) * rate)
+    local retry_after = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        retry_after = (1 - tokens) / rate
+    end
+    redis.call("HSET", KEYS[1], "tokens", tokens, "ts", now)
+    redis.call("EXPIRE", KEYS[1], 61)
+    return tostring(retry_after)
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but the `redis` package is not installed")
+
+        self._redis = redis.asyncio.from_url(url)
+        self._take = self._redis.register_script(self.TAKE_SCRIPT)
+
+    async def take(self, key: str, per_minute: int) -> float:
+        return float(await self._take(keys=[f"ratelimit:{key}"], args=[per_minute]))
+
+    async def acquire(self, key: str, limit: int) -> bool:
+        key = f"inflight:{key}"
+        if await self._redis.incr(key) > limit:
+            await self._redis.decr(key)
+            return False
+        # Safety net so a crashed worker can't hold a slot forever
+        await self._redis.expire(key, 300)
+        return True
+
+    async def release(self, key: str):
+        await self._redis.decr(f"inflight:{key}")
+
+
+@lru_cache(maxsize=1)
+def get_backend():
+    url = get_settings().RATE_LIMIT_REDIS_URL
+    return RedisBackend(url) if url else MemoryBackend()
+
+
+def _limits(route_class: str) -> int:
+    settings = get_settings()
+    return {
+        "ocr": settings.RATE_LIMIT_OCR_PER_MINUTE,
+        "auth": settings.RATE_LIMIT_AUTH_PER_MINUTE,
+        "crud": settings.RATE_LIMIT_CRUD_PER_MINUTE,
+    }[route_class]
+
+
+def _user_key(request: Request) -> str | None:
+    authorization = request.headers.get("Authorization", "")
+    if not authorization.startswith("Bearer "):
+        return None
+    payload = security.verify_access_token(authorization[len("Bearer "):])
+    if payload is None or not payload.get("sub"):
+        return None
+    return f"user:{payload['sub']}"
+
+
+def _too_many_requests(route_class: str, retry_after: float) -> JSONResponse:
+    counters[(route_class, "limited")] += 1
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many requests, please slow down."},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+async def rate_limit(request: Request, call_next):
+    """
+    Token buckets per route class: one per user (when a valid bearer token is
+    sent) and one per client IP, which is RATE_LIMIT_IP_MULTIPLIER times
+    larger for authenticated requests so users behind one NAT don't starve
+    each other. OCR uploads are additionally capped at
+    RATE_LIMIT_OCR_CONCURRENCY in-flight requests (or upload jobs) per user.
+    """
+    settings = get_settings()
+    route_class = classify(request.url.path)
+    if not settings.RATE_LIMIT_ENABLED or route_class == "exempt" or request.method == "OPTIONS":
+        return await call_next(request)
+
+    backend = get_backend()
+    per_minute = _limits(route_class)
+    user_key = _user_key(request)
+    client_ip = request.client.host if request.client else "unknown"
+
+    if user_key:
+        ip_key = f"users-ip:{client_ip}"
+        buckets = [(user_key, per_minute), (ip_key, per_minute * settings.RATE_LIMIT_IP_MULTIPLIER)]
+    else:
+        ip_key = f"ip:{client_ip}"
+        buckets = [(ip_key, per_minute)]
+
+    for key, limit in buckets:
+        retry_after = await backend.take(f"{route_class}:{key}", limit)
+        if retry_after:
+            return _too_many_requests(route_class, retry_after)
+
+    if route_class != "ocr":
+        counters[(route_class, "allowed")] += 1
+        return await call_next(request)
+
+    slot = f"ocr:{user_key or ip_key}"
+    if not await backend.acquire(slot, settings.RATE_LIMIT_OCR_CONCURRENCY):
+        return _too_many_requests(route_class, 1)
+
+    counters[(route_class, "allowed")] += 1
+    request.state.ocr_slot = slot
+    try:
+        return await call_next(request)
+    finally:
+        # Unless the endpoint took the slot to hold past its response (see take_ocr_slot)
+        if request.state.ocr_slot is not None:
+            await backend.release(slot)
+
+
+def take_ocr_slot(request: Request) -> str | None:
+    """
+    Hands the request's OCR concurrency slot to the caller, which must pass it
+    to release_ocr_slot when its work is done. For endpoints that respond
+    before the OCR finishes (upload jobs). None when rate limiting is off.
+    """
+    slot = getattr(request.state, "ocr_slot", None)
+    request.state.ocr_slot = None
+    return slot
+
+
+async def release_ocr_slot(slot: str | None):
+    if slot is not None:
+        await get_backend().release(slot)
+
+
+def snapshot() -> dict:
+    """Allowed/limited counts by route class for this worker process."""
+    by_class = {}
+    for (route_class, outcome), count in counters.items():
+        by_class.setdefault(route_class, {"allowed": 0, "limited": 0})[outcome] = count
+    return {"pid": os.getpid(), "backend": type(get_backend()).__name__, "counters": by_class}
@@ -1,22 +1,44 @@
+import uuid
 from datetime import datetime, timedelta, timezone
-from jose import jwt, JWTError
 
-from app.core.config import settings 
-
-SECRET_KEY = settings.SECRET_KEY
-ALGORITHM = settings.ALGORITHM
-ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.config import get_settings
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
+    from jose import jwt
+
+    settings = get_settings()
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc)})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 def verify_access_token(token: str):
+    from jose import jwt, JWTError
+
+    settings = get_settings()
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload  # You can return user id, email, etc. from payload
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
         return None
+    # Scoped tokens (stream tickets) are only good for what they were issued for
+    if "scope" in payload:
+        return None
+    return payload  # You can return user id, email, etc. from payload
+
+def create_stream_ticket(subject: str) -> str:
+    """A short-lived token for opening /api/events, which can't send the access token in a header."""
+    expires_delta = timedelta(seconds=get_settings().EVENTS_TICKET_SECONDS)
+    return create_access_token({"sub": subject, "scope": "events", "jti": uuid.uuid4().hex}, expires_delta)
+
+def verify_stream_ticket(ticket: str):
+    from jose import jwt, JWTError
+
+    settings = get_settings()
+    try:
+        payload = jwt.decode(ticket, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("scope") != "events" or not payload.get("jti"):
+        return None
+    return payload
@@ -0,0 +1,145 @@
+import logging
+import os
+import signal
+import time
+
+import uvicorn
+
+from app.core import lifecycle
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class WorkerPool:
+    """A group of identical uvicorn workers sharing one listening socket."""
+
+    def __init__(self, name: str, app, host: str, port: int, workers: int, on_fork=None):
+        self.name = name
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.on_fork = on_fork
+        self.pids: set[int] = set()
+        self.sock = None
+
+    def bind(self):
+        self.sock = uvicorn.Config(self.app, host=self.host, port=self.port).bind_socket()
+
+
+class Supervisor:
+    """
+    Pre-fork process manager.
+
+    The caller imports its apps (and any shared read-only state such as OCR
+    model weights) before calling run(), so every forked worker shares those
+    pages copy-on-write instead of loading its own copy.
+
+    On SIGTERM/SIGINT the supervisor:
+    1. marks every worker as draining, so readiness probes return 503 and the
+       load balancer stops routing new traffic (DRAIN_SECONDS);
+    2. sends SIGTERM to the workers, which stop accepting connections and let
+       in-flight requests finish (GRACEFUL_TIMEOUT);
+    3. kills anything still running after that.
+    """
+
+    def __init__(self, pools: list[WorkerPool], drain_seconds: float, graceful_timeout: int):
+        self.pools = pools
+        self.drain_seconds = drain_seconds
+        self.graceful_timeout = graceful_timeout
+        self._signals_received = 0
+
+    def run(self):
+        if not hasattr(os, "fork"):
+            raise RuntimeError("The production server needs os.fork; use `uvicorn --factory app.main:create_app` on this platform")
+
+        for pool in self.pools:
+            pool.bind()
+            logger.info("Starting %d %s worker(s) on %s:%d", pool.workers, pool.name, pool.host, pool.port)
+            for _ in range(pool.workers):
+                self._spawn(pool)
+
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+
+        while not self._signals_received:
+            self._reap(respawn=True)
+            time.sleep(0.5)
+
+        self._shutdown()
+
+    def _handle_signal(self, signum, frame):
+        self._signals_received += 1
+
+    def _spawn(self, pool: WorkerPool):
+        pid = os.fork()
+        if pid:
+            pool.pids.add(pid)
+            return
+
+        # Child: uvicorn installs its own handlers inside Server.run()
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            if pool.on_fork:
+                pool.on_fork()
+            config = uvicorn.Config(pool.app, timeout_graceful_shutdown=self.graceful_timeout)
+            uvicorn.Server(config).run(sockets=[pool.sock])
+        except BaseException:
+            logger.exception("%s worker %d crashed", pool.name, os.getpid())
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _reap(self, respawn: bool):
+        while True:
+            try:
+                pid, exit_status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            for pool in self.pools:
+                if pid in pool.pids:
+                    pool.pids.discard(pid)
+                    if respawn:
+                        logger.warning("%s worker %d exited with status %d, restarting", pool.name, pid, exit_status)
+                        self._spawn(pool)
+
+    def _alive(self) -> bool:
+        return any(pool.pids for pool in self.pools)
+
+    def _wait(self, seconds: float, signals_seen: int):
+        # A further signal during the wait skips the rest of it
+        deadline = time.monotonic() + seconds
+        while self._alive() and time.monotonic() < deadline and self._signals_received == signals_seen:
+            self._reap(respawn=False)
+            time.sleep(0.1)
+
+    def _send(self, signum: int):
+        for pool in self.pools:
+            for pid in pool.pids:
+                try:
+                    os.kill(pid, signum)
+                except ProcessLookupError:
+                    pass
+
+    def _shutdown(self):
+        lifecycle.mark_draining()
+        logger.info("Draining for %.1fs before stopping workers", self.drain_seconds)
+        self._wait(self.drain_seconds, self._signals_received)
+
+        self._send(signal.SIGTERM)
+        self._wait(self.graceful_timeout + 5, self._signals_received)
+
+        if self._alive():
+            logger.warning("Workers still running after graceful timeout, killing them")
+            self._send(signal.SIGKILL)
+            while self._alive():
+                self._reap(respawn=False)
+                time.sleep(0.1)
+
+        for pool in self.pools:
+            pool.sock.close()
@@ -2,3 +2,5 @@ from app.db.base_class import Base
 from app.models.user import User
 from app.models.car import Car
 from app.models.fuel_receipt import FuelReceipt
+from app.models.car_purge import CarPurge
+from app.models.fx_rate import FxRate
@@ -0,0 +1,16 @@
+import os
+import time
+import uuid
+
+
+def uuid7() -> str:
+    """
+    Time-ordered UUID (RFC 9562 version 7): a 48-bit millisecond timestamp
+    followed by random bits. New rows land at the right-hand edge of the
+    primary key index instead of on a random leaf page, which keeps the
+    index dense and cuts the pages each insert dirties.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version
+    value = value & ~(0x3 << 62) | 0x2 << 62  # variant
+    return str(uuid.UUID(int=value))
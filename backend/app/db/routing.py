@@ -0,0 +1,92 @@
+import hashlib
+import hmac
+import time
+from contextvars import ContextVar
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core import security
+from app.core.config import get_settings
+
+# Returned after a request that committed a write and echoed back by the
+# client. Until the timestamp passes, that user's reads go to the primary, so
+# they always see their own writes regardless of replica lag. The value is
+# signed and bound to the user, so a client can't forge it or replay another
+# user's to push reads onto the primary.
+PRIMARY_UNTIL_HEADER = "X-Primary-Until"
+
+READ_METHODS = {"GET", "HEAD"}
+
+# Per request: whether a session committed changes, and for whom. A mutable
+# dict because sync endpoints run in the threadpool on a copy of the context.
+_request_writes: ContextVar[dict | None] = ContextVar("request_writes", default=None)
+
+
+@event.listens_for(Session, "after_flush")
+def _flushed(session, flush_context):
+    session.info["flushed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _committed(session):
+    writes = _request_writes.get()
+    if session.info.pop("flushed", False) and writes is not None:
+        writes["committed"] = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _rolled_back(session):
+    session.info.pop("flushed", None)
+
+
+def set_writer(subject: str):
+    """Binds this request's writes to `subject` when it has no bearer token yet (e.g. registration)."""
+    writes = _request_writes.get()
+    if writes is not None:
+        writes["subject"] = subject
+
+
+def _subject(request: Request) -> str | None:
+    authorization = request.headers.get("Authorization", "")
+    if not authorization.startswith("Bearer "):
+        return None
+    payload = security.verify_access_token(authorization[len("Bearer "):])
+    return payload.get("sub") if payload else None
+
+
+def _signature(subject: str, primary_until: str) -> str:
+    message = f"{subject}|{primary_until}".encode()
+    return hmac.new(get_settings().SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def use_replica(request: Request) -> bool:
+    if request.method not in READ_METHODS:
+        return False
+
+    primary_until, _, signature = request.headers.get(PRIMARY_UNTIL_HEADER, "").partition(".")
+    subject = _subject(request)
+    if not subject or not signature or not hmac.compare_digest(signature, _signature(subject, primary_until)):
+        return True
+
+    try:
+        return time.time() >= int(primary_until)
+    except ValueError:
+        return True
+
+
+async def read_your_writes(request: Request, call_next):
+    writes = {"committed": False, "subject": None}
+    token = _request_writes.set(writes)
+    try:
+        response = await call_next(request)
+    finally:
+        _request_writes.reset(token)
+
+    subject = writes["subject"] or _subject(request)
+    if writes["committed"] and subject and response.status_code < 400:
+        primary_until = str(int(time.time() + get_settings().READ_YOUR_WRITES_SECONDS + 1))
+        response.headers[PRIMARY_UNTIL_HEADER] = f"{primary_until}.{_signature(subject, primary_until)}"
+
+    return response
@@ -1,6 +1,38 @@
+from functools import lru_cache
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
+from app.core.config import get_settings
+
+def _create_engine(url: str):
+    # FastAPI runs sync endpoints in a threadpool, so SQLite connections must be shareable across threads
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    return create_engine(url, connect_args=connect_args)
+
+@lru_cache(maxsize=1)
+def get_engine():
+    return _create_engine(get_settings().DATABASE_URL)
+
+@lru_cache(maxsize=1)
+def get_replica_engine():
+    url = get_settings().REPLICA_DATABASE_URL
+    return _create_engine(url) if url else get_engine()
+
+@lru_cache(maxsize=1)
+def get_sessionmaker():
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+@lru_cache(maxsize=1)
+def get_read_sessionmaker():
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_replica_engine())
+
+def SessionLocal():
+    return get_sessionmaker()()
+
+def ReadSessionLocal():
+    return get_read_sessionmaker()()
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def dispose_engines():
+    """Drops pooled connections inherited from a parent process (call after fork)."""
+    get_engine().dispose(close=False)
+    get_replica_engine().dispose(close=False)
@@ -1,36 +1,75 @@
-from fastapi import FastAPI, UploadFile, File
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import auth, health, cars, fuel_receipts
-# import easyocr
-# import shutil
-# import os
-
-app = FastAPI()
-# reader = easyocr.Reader(['en'])
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
-app.include_router(cars.router, prefix="/api/cars", tags=["cars"])
-app.include_router(fuel_receipts.router, prefix="/api/fuel-receipts", tags=["fuel-receipts"])
-app.include_router(health.router, prefix="/api/health", tags=["health"])
-
-# @app.post("/ocr")
-# async def perform_ocr(file: UploadFile = File(...)):
-#     temp_path = f"temp_{file.filename}"
-    
-#     with open(temp_path, "wb") as buffer:
-#         shutil.copyfileobj(file.file, buffer)
-    
-#     result = reader.readtext(temp_path)
-#     os.remove(temp_path)
-
-#     # Format result as plain text
-#     extracted_text = [item[1] for item in result]
-#     return {"text": extracted_text}
+from app.api import auth, health, cars, events, fuel_receipts
+from app.core import idempotency, purge, rate_limit
+from app.core.config import get_settings
+from app.db import routing, session
+
+logger = logging.getLogger("uvicorn.error")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Each API worker runs one purge loop; they share the work through row locks
+    purge_worker = asyncio.create_task(purge.run_worker())
+    yield
+    purge_worker.cancel()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
+
+    app.middleware("http")(routing.read_your_writes)
+    app.middleware("http")(rate_limit.rate_limit)
+    # Added last so it wraps everything else, including 429 responses
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[routing.PRIMARY_UNTIL_HEADER, "Retry-After", idempotency.REPLAYED_HEADER],
+    )
+
+    app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+    app.include_router(cars.router, prefix="/api/cars", tags=["cars"])
+    app.include_router(fuel_receipts.router, prefix="/api/fuel-receipts", tags=["fuel-receipts"])
+    app.include_router(health.router, prefix="/api/health", tags=["health"])
+    app.include_router(events.router, prefix="/api/events", tags=["events"])
+
+    return app
+
+
+def preload():
+    """
+    Does the work that importing the app no longer does eagerly: reads
+    settings, builds the DB engines (no connections yet) and imports the
+    password/JWT libraries. The production server calls this once before
+    forking so workers don't each pay for it on their first request.
+    """
+    session.get_engine()
+    session.get_replica_engine()
+    rate_limit.get_backend()
+    idempotency.get_store()
+    auth.get_pwd_context()
+    from jose import jwt  # noqa: F401
+
+
+def warn_about_per_worker_state(api_workers: int):
+    """Logs the state that stays per process when several API workers run without Redis."""
+    if api_workers <= 1:
+        return
+    if not get_settings().EVENTS_REDIS_URL:
+        logger.warning(
+            "%d API workers without EVENTS_REDIS_URL: events only reach streams on the worker that published them, "
+            "so clients upload through /upload instead of jobs, and a stream ticket can be used once per worker", api_workers,
+        )
+    if not get_settings().IDEMPOTENCY_REDIS_URL:
+        logger.warning(
+            "%d API workers without IDEMPOTENCY_REDIS_URL: an Idempotency-Key retry that lands on another worker runs again, "
+            "and only receipts have a unique index to stop the duplicate (POST /api/cars creates a second car)", api_workers,
+        )
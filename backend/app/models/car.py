@@ -1,9 +1,9 @@
 import enum
 
-from sqlalchemy import Column, ForeignKey, String, Integer, Numeric, Boolean, DateTime, Enum
+from sqlalchemy import Column, ForeignKey, String, Integer, Numeric, Boolean, DateTime, Enum, Index, Uuid
 from sqlalchemy.sql import func
-import uuid
 from app.db.base_class import Base
+from app.db.ids import uuid7
 
 class FuelType(str, enum.Enum):
     petrol = "petrol"
@@ -15,8 +15,8 @@ class FuelType(str, enum.Enum):
 class Car(Base):
     __tablename__ = "cars"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=uuid7)
+    user_id = Column(Uuid(as_uuid=False), ForeignKey("users.id"), nullable=False)
     name = Column(String, nullable=False)
     make = Column(String, nullable=False)
     model = Column(String, nullable=False)
@@ -28,4 +28,11 @@ class Car(Base):
     is_default = Column(Boolean, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Set when the car is deleted; its receipts are hidden and purged in the background (app/core/purge.py)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Only tombstoned cars are indexed, so the "hide deleted cars' receipts" lookup stays tiny
+        Index("ix_cars_deleted_user_id", "user_id", postgresql_where=deleted_at.isnot(None), sqlite_where=deleted_at.isnot(None)),
+    )
     
\ No newline at end of file
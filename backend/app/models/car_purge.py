@@ -0,0 +1,16 @@
+from sqlalchemy import Column, ForeignKey, Integer, DateTime, Uuid
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class CarPurge(Base):
+    """Progress of removing a deleted car's receipts; kept after the car row itself is gone."""
+    __tablename__ = "car_purges"
+
+    car_id = Column(Uuid(as_uuid=False), primary_key=True)
+    user_id = Column(Uuid(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    purged_receipts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    # Failed batches back off, so one purge that keeps failing doesn't hold up the rest
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
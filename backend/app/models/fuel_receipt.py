@@ -1,18 +1,41 @@
-from sqlalchemy import Column, ForeignKey, String, Numeric, DateTime, Date
+from sqlalchemy import Column, ForeignKey, String, Numeric, DateTime, Date, DDL, Index, Uuid, event
 from sqlalchemy.sql import func
-import uuid
 from app.db.base_class import Base
+from app.db.ids import uuid7
+
+# Hash partitions of fuel_receipts on Postgres. Changing this means repartitioning (see migration c5d8e2a7f190).
+PARTITIONS = 16
 
 class FuelReceipt(Base):
     __tablename__ = "fuel_receipts"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    # user_id is part of the primary key because a partitioned table's unique indexes must include the partition key
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=uuid7)
     date = Column(Date, nullable=False)
     amount_paid = Column(Numeric, nullable=False)
     volume_purchased = Column(Numeric, nullable=False)
     advertised_price = Column(Numeric, nullable=False)
     odometer = Column(Numeric, nullable=False)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    car_id = Column(String, ForeignKey("cars.id"), nullable=False)
+    currency = Column(String(3), nullable=False)
+    # amount_paid/advertised_price converted to the owner's currency when the receipt is written
+    amount_paid_normalized = Column(Numeric, nullable=False)
+    advertised_price_normalized = Column(Numeric, nullable=False)
+    user_id = Column(Uuid(as_uuid=False), ForeignKey("users.id"), primary_key=True)
+    car_id = Column(Uuid(as_uuid=False), ForeignKey("cars.id"), nullable=False, index=True)
+    # Hash of the normalized (user_id, car_id, date, amount_paid, odometer); the unique index rejects double submissions
+    dedup_key = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_fuel_receipts_user_id_dedup_key", "user_id", "dedup_key", unique=True),
+        Index("ix_fuel_receipts_user_id_date", "user_id", "date"),
+        # Every receipt query is scoped to one user, so Postgres only ever scans that user's partition
+        {"postgresql_partition_by": "HASH (user_id)"},
+    )
+
+
+for remainder in range(PARTITIONS):
+    event.listen(FuelReceipt.__table__, "after_create", DDL(
+        f"CREATE TABLE fuel_receipts_p{remainder} PARTITION OF fuel_receipts FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+    ).execute_if(dialect="postgresql"))
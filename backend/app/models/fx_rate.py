@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, Numeric, Date
+from app.db.base_class import Base
+
+class FxRate(Base):
+    """Units of `currency` per one unit of FX_BASE_CURRENCY on `date` (see app/core/fx.py)."""
+    __tablename__ = "fx_rates"
+
+    # (currency, date) is the lookup order: "latest rate for EUR on or before 2025-03-01"
+    currency = Column(String(3), primary_key=True)
+    date = Column(Date, primary_key=True)
+    rate = Column(Numeric, nullable=False)
@@ -0,0 +1,142 @@
+import logging
+import os
+from abc import ABC, abstractmethod
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class OCRBackend(ABC):
+    """
+    Interface every OCR backend implements: EasyOCR's readtext contract,
+    returning [(bbox, text, confidence), ...] with bbox as four [x, y]
+    corners, so reconstruct_receipt_text works on any backend's output.
+    A backend missing one of the methods fails when it is built.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def readtext(self, image, **kwargs):
+        ...
+
+    @abstractmethod
+    def detect(self, image):
+        """Detection only: returns (greyscale image, horizontal boxes, free-form boxes) in EasyOCR's formats."""
+
+    @abstractmethod
+    def recognize(self, grey, horizontal_boxes: list, free_boxes: list):
+        """Recognition of the given boxes only, in readtext's result format."""
+
+
+class EasyOCRBackend(OCRBackend):
+    """The stock EasyOCR PyTorch CRAFT detector + CRNN recognizer."""
+
+    name = "easyocr"
+
+    def __init__(self, quantize: bool = True):
+        import easyocr
+        self.reader = easyocr.Reader(['en'], gpu=False, quantize=quantize)
+
+    def readtext(self, image, **kwargs):
+        return self.reader.readtext(image, **kwargs)
+
+    def detect(self, image):
+        from easyocr.utils import reformat_input
+
+        colour, grey = reformat_input(image)
+        horizontal_boxes, free_boxes = self.reader.detect(colour, reformat=False)
+        return grey, horizontal_boxes[0], free_boxes[0]
+
+    def recognize(self, grey, horizontal_boxes: list, free_boxes: list):
+        return self.reader.recognize(grey, horizontal_boxes, free_boxes, reformat=False)
+
+
+class _OnnxModule:
+    """
+    Drop-in for one of EasyOCR's torch modules: takes torch tensors, runs an
+    onnxruntime session on CPU and hands torch tensors back, so EasyOCR's own
+    resizing, box grouping and CTC decoding run unchanged around it.
+    """
+
+    def __init__(self, path: str, threads: int):
+        import onnxruntime
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"ONNX model not found: {path}")
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+    def eval(self):
+        return self
+
+    def __call__(self, *inputs):
+        import torch
+
+        # Unused inputs (the recognizer's `text`) are pruned at export time
+        feeds = {name: tensor.cpu().numpy() for name, tensor in zip(self.input_names, inputs)}
+        outputs = [torch.from_numpy(output) for output in self.session.run(None, feeds)]
+        return outputs[0] if len(outputs) == 1 else tuple(outputs)
+
+
+class OnnxBackend(EasyOCRBackend):
+    """
+    EasyOCR with the detector and recognizer swapped for ONNX exports (fp32 or
+    int8, see app/ocr/onnx_export.py). If onnxruntime fails on an image, that
+    image is re-read with the stock PyTorch models.
+    """
+
+    name = "onnx"
+
+    DETECTOR_FILE = "detector.onnx"
+    RECOGNIZER_FILE = "recognizer.onnx"
+
+    def __init__(self, model_dir: str, threads: int = 1):
+        detector = _OnnxModule(os.path.join(model_dir, self.DETECTOR_FILE), threads)
+        recognizer = _OnnxModule(os.path.join(model_dir, self.RECOGNIZER_FILE), threads)
+
+        # Builds the pre/post-processing; the torch weights it loads are
+        # released once the modules are replaced
+        super().__init__(quantize=False)
+        self.reader.detector = detector
+        self.reader.recognizer = recognizer
+        self._fallback = None
+
+    def _easyocr(self, stage: str) -> EasyOCRBackend:
+        logger.exception("ONNX OCR %s failed, retrying with EasyOCR", stage)
+        if self._fallback is None:
+            self._fallback = EasyOCRBackend()
+        return self._fallback
+
+    def readtext(self, image, **kwargs):
+        try:
+            return super().readtext(image, **kwargs)
+        except Exception:
+            return self._easyocr("readtext").readtext(image, **kwargs)
+
+    def detect(self, image):
+        try:
+            return super().detect(image)
+        except Exception:
+            return self._easyocr("detection").detect(image)
+
+    def recognize(self, grey, horizontal_boxes: list, free_boxes: list):
+        # The boxes are in EasyOCR's formats whichever detector found them
+        try:
+            return super().recognize(grey, horizontal_boxes, free_boxes)
+        except Exception:
+            return self._easyocr("recognition").recognize(grey, horizontal_boxes, free_boxes)
+
+
+def load_backend(name: str, onnx_dir: str, threads: int = 1) -> OCRBackend:
+    if name == "onnx":
+        try:
+            return OnnxBackend(onnx_dir, threads)
+        except (ImportError, FileNotFoundError) as error:
+            logger.warning("ONNX OCR backend unavailable (%s), falling back to EasyOCR", error)
+    elif name != "easyocr":
+        raise ValueError(f"Unknown OCR backend: {name}")
+
+    return EasyOCRBackend()
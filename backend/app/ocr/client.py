@@ -0,0 +1,33 @@
+import httpx
+from fastapi import HTTPException, status
+
+from app.core.config import get_settings
+
+_client: httpx.AsyncClient | None = None
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        # One pooled client per worker; OCR on CPU can take several seconds per image
+        _client = httpx.AsyncClient(base_url=get_settings().OCR_SERVICE_URL, timeout=httpx.Timeout(60.0, connect=2.0))
+    return _client
+
+async def read_receipt(image: bytes, filename: str | None = None) -> str:
+    """Sends an image to the OCR tier and returns the structured text."""
+    try:
+        response = await _get_client().post("/ocr", files={"file": (filename or "receipt", image)})
+        response.raise_for_status()
+    except httpx.HTTPError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="OCR service unavailable"
+        )
+
+    return response.json()["text"]
+
+def is_ready() -> bool:
+    try:
+        response = httpx.get(f"{get_settings().OCR_SERVICE_URL}/ready", timeout=1.0)
+    except httpx.HTTPError:
+        return False
+    return response.status_code == 200
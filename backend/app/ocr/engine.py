@@ -0,0 +1,98 @@
+import logging
+import threading
+from functools import lru_cache
+
+from app.core.config import get_settings
+from app.ocr import roi
+from app.ocr.backends import load_backend
+
+# torch already parallelises a single inference, so concurrent calls in the
+# same process only fight over cores. Scale with OCR_WORKERS instead.
+_inference_lock = threading.Lock()
+
+logger = logging.getLogger("uvicorn.error")
+
+@lru_cache(maxsize=1)
+def get_reader():
+    # Built on first use so processes that never run OCR (the API tier) don't load torch
+    settings = get_settings()
+    return load_backend(settings.OCR_BACKEND, settings.OCR_ONNX_DIR, settings.OCR_THREADS)
+
+def is_reader_loaded() -> bool:
+    return get_reader.cache_info().currsize > 0
+
+def configure_worker():
+    """Called in each OCR worker right after it is forked."""
+    import torch
+    torch.set_num_threads(get_settings().OCR_THREADS)
+
+def reconstruct_receipt_text(easyocr_results, y_tolerance=10):
+    """
+    Reconstructs receipt text preserving structure using bounding box coordinates.
+    
+    y_tolerance: Max vertical difference (pixels) considered for the same line.
+    """
+    
+    # Extract coordinates and text from the full EasyOCR result
+    data = []
+    for (bbox, text, confidence) in easyocr_results:
+        # Get the top-left corner (x1, y1)
+        x1 = bbox[0][0]
+        y1 = bbox[0][1]
+        data.append({'x': x1, 'y': y1, 'text': text})
+    
+    # Sort all items primarily by Y, then by X
+    data.sort(key=lambda item: (item['y'], item['x']))
+
+    structured_text_lines = []
+    current_line = []
+    
+    if not data:
+        return ""
+
+    # Start with the first item's Y-coordinate
+    current_y = data[0]['y']
+
+    for item in data:
+        # Check if the item is on a new line (y-coordinate change > tolerance)
+        if item['y'] > current_y + y_tolerance:
+            # New line detected:
+            # 1. Sort the previous line's elements by X
+            current_line.sort(key=lambda x: x['x'])
+            
+            # 2. Join words with a single space and add the completed line
+            line_text = " ".join([elem['text'] for elem in current_line])
+            structured_text_lines.append(line_text)
+            
+            # 3. Start a new line
+            current_line = []
+            current_y = item['y']
+            
+        current_line.append(item)
+
+    # Process the last line (if any)
+    if current_line:
+        current_line.sort(key=lambda x: x['x'])
+        line_text = " ".join([elem['text'] for elem in current_line])
+        structured_text_lines.append(line_text)
+
+    # Join all lines with a newline character
+    return "\n".join(structured_text_lines)
+
+def read_receipt(image: bytes) -> str:
+    """Runs OCR over an encoded image (jpg/png bytes) and returns the structured text."""
+    settings = get_settings()
+    reader = get_reader()
+    if settings.OCR_PREPROCESS:
+        # cv2 comes with easyocr, so only OCR processes pay for importing it
+        from app.ocr import preprocess
+        image, timings = preprocess.run(image, preprocess.parse_stages(settings.OCR_PREPROCESS), target_text_height=settings.OCR_TARGET_TEXT_HEIGHT)
+        logger.debug("OCR preprocessing ms: %s", ", ".join(f"{stage}={ms:.1f}" for stage, ms in timings.items()))
+
+    with _inference_lock:
+        if settings.OCR_MODE == "roi":
+            result, stats = roi.readtext(reader, image)
+            logger.debug("ROI OCR: recognized %d of %d boxes, fields %s", stats["recognized"], stats["boxes"], stats["fields"])
+        else:
+            result = reader.readtext(image)
+    return reconstruct_receipt_text(result)
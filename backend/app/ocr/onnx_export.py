@@ -0,0 +1,88 @@
+"""
+Exports EasyOCR's English detector and recognizer to ONNX for the "onnx" OCR
+backend, optionally quantizing the recognizer to int8.
+
+Usage (from backend/):
+    python -m app.ocr.onnx_export --out models/onnx --int8
+"""
+import argparse
+import os
+
+from app.ocr.backends import OnnxBackend
+
+
+def _mean_over_height():
+    import torch
+
+    class MeanOverHeight(torch.nn.Module):
+        # Same result as the recognizer's AdaptiveAvgPool2d((None, 1)), which
+        # the ONNX exporter can't handle with a dynamic input width
+        def forward(self, x):
+            return x.mean(dim=3, keepdim=True)
+
+    return MeanOverHeight()
+
+
+def export(out_dir: str, int8: bool, opset: int = 17):
+    import easyocr
+    import torch
+
+    os.makedirs(out_dir, exist_ok=True)
+    # Dynamically quantized torch modules don't export; quantize the ONNX graph instead
+    reader = easyocr.Reader(['en'], gpu=False, quantize=False)
+    reader.recognizer.AdaptiveAvgPool = _mean_over_height()
+
+    detector_path = os.path.join(out_dir, OnnxBackend.DETECTOR_FILE)
+    recognizer_path = os.path.join(out_dir, OnnxBackend.RECOGNIZER_FILE)
+    if int8:
+        recognizer_path = recognizer_path.replace(".onnx", ".fp32.onnx")
+
+    with torch.no_grad():
+        torch.onnx.export(
+            reader.detector,
+            torch.rand(1, 3, 608, 800),
+            detector_path,
+            opset_version=opset,
+            dynamo=False,
+            input_names=["input"],
+            output_names=["output", "feature"],
+            dynamic_axes={"input": {0: "batch", 2: "height", 3: "width"}, "output": {0: "batch", 1: "out_height", 2: "out_width"}, "feature": {0: "batch", 2: "feature_height", 3: "feature_width"}},
+        )
+        # The recognizer sees grey crops resized to 64px high; width varies per batch
+        torch.onnx.export(
+            reader.recognizer,
+            (torch.rand(1, 1, 64, 256), torch.zeros(1, 26, dtype=torch.long)),
+            recognizer_path,
+            opset_version=opset,
+            dynamo=False,  # the TorchScript exporter handles the LSTM's dynamic width
+            input_names=["input", "text"],
+            output_names=["output"],
+            dynamic_axes={"input": {0: "batch", 3: "width"}, "output": {0: "batch", 1: "steps"}},
+        )
+
+    if int8:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        # Only the recognizer's LSTM/linear layers are quantized. onnxruntime
+        # runs dynamically quantized convolutions (all of CRAFT) several
+        # times slower than fp32 on CPU, so the detector stays fp32.
+        quantize_dynamic(
+            recognizer_path,
+            os.path.join(out_dir, OnnxBackend.RECOGNIZER_FILE),
+            weight_type=QuantType.QInt8,
+            op_types_to_quantize=["MatMul", "Gemm", "LSTM"],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default="models/onnx", help="directory to write detector.onnx and recognizer.onnx to")
+    parser.add_argument("--int8", action="store_true", help="quantize the recognizer's weights to int8 (keeps the fp32 export alongside)")
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args()
+
+    export(args.out, args.int8, args.opset)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Receipt image clean-up that runs before OCR. Each stage takes and returns a
+numpy image and can be switched on or off through OCR_PREPROCESS, a comma
+separated list of stage names applied in the order of STAGES:
+
+- crop: find the receipt's outline and warp it flat, dropping the background
+- resize: scale so the typical text height is OCR_TARGET_TEXT_HEIGHT pixels
+- deskew: rotate so text lines are horizontal
+- binarize: greyscale + adaptive threshold
+
+Resizing runs before deskewing and thresholding so they work on the smaller
+image, and a consistent text height keeps reconstruct_receipt_text's
+y_tolerance meaningful across phone cameras.
+"""
+import time
+
+import cv2
+import numpy as np
+
+
+def _grey(image: np.ndarray) -> np.ndarray:
+    return image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def _ink_mask(grey: np.ndarray) -> np.ndarray:
+    # Text is darker than the paper; Otsu picks the split per image
+    _, mask = cv2.threshold(grey, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    return mask
+
+
+def _order_corners(points: np.ndarray) -> np.ndarray:
+    """Sorts four points as top-left, top-right, bottom-right, bottom-left."""
+    sums = points.sum(axis=1)
+    diffs = np.diff(points, axis=1).ravel()
+    return np.array([points[np.argmin(sums)], points[np.argmin(diffs)], points[np.argmax(sums)], points[np.argmax(diffs)]], dtype=np.float32)
+
+
+def crop_document(image: np.ndarray, min_area_ratio: float = 0.2, **_) -> np.ndarray:
+    # Find the outline on a small copy; edges don't need full resolution
+    scale = min(1.0, 800 / max(image.shape[:2]))
+    small = cv2.resize(_grey(image), None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    edges = cv2.Canny(cv2.GaussianBlur(small, (5, 5), 0), 50, 150)
+    edges = cv2.dilate(edges, np.ones((3, 3), np.uint8))
+
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    min_area = min_area_ratio * small.shape[0] * small.shape[1]
+    outline = None
+    for contour in sorted(contours, key=cv2.contourArea, reverse=True)[:5]:
+        if cv2.contourArea(contour) < min_area:
+            break
+        approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+        if len(approx) == 4:
+            outline = approx
+            break
+
+    if outline is None:
+        return image
+
+    corners = _order_corners(outline.reshape(4, 2).astype(np.float32) / scale)
+    (top_left, top_right, bottom_right, bottom_left) = corners
+    width = int(max(np.linalg.norm(top_right - top_left), np.linalg.norm(bottom_right - bottom_left)))
+    height = int(max(np.linalg.norm(bottom_left - top_left), np.linalg.norm(bottom_right - top_right)))
+    target = np.array([[0, 0], [width - 1, 0], [width - 1, height - 1], [0, height - 1]], dtype=np.float32)
+
+    return cv2.warpPerspective(image, cv2.getPerspectiveTransform(corners, target), (width, height))
+
+
+def resize_to_text_height(image: np.ndarray, target_text_height: int = 32, **_) -> np.ndarray:
+    _, _, stats, _ = cv2.connectedComponentsWithStats(_ink_mask(_grey(image)), connectivity=8)
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+    # Character-like blobs only: not specks, not lines, borders or barcodes
+    characters = heights[(heights >= 4) & (heights <= image.shape[0] / 10) & (widths <= heights * 3)]
+    if characters.size < 10:
+        return image
+
+    scale = float(np.clip(target_text_height / np.median(characters), 0.25, 2.0))
+    if abs(scale - 1) < 0.05:
+        return image
+
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+    return cv2.resize(image, None, fx=scale, fy=scale, interpolation=interpolation)
+
+
+def deskew(image: np.ndarray, max_angle: float = 15.0, **_) -> np.ndarray:
+    # Smear characters into line-shaped blobs, then take the median angle of the lines
+    mask = cv2.morphologyEx(_ink_mask(_grey(image)), cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (25, 3)))
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    angles = []
+    for contour in contours:
+        (_, _), (width, height), angle = cv2.minAreaRect(contour)
+        if max(width, height) < 3 * max(1.0, min(width, height)):
+            continue  # not line-shaped
+        # OpenCV versions disagree on the angle's range; take the long side's angle in [-90, 90)
+        if width < height:
+            angle += 90
+        angles.append((angle + 90) % 180 - 90)
+
+    if not angles:
+        return image
+
+    angle = float(np.median(angles))
+    if abs(angle) < 0.5 or abs(angle) > max_angle:
+        return image
+
+    height, width = image.shape[:2]
+    rotation = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(image, rotation, (width, height), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+
+def binarize(image: np.ndarray, block_size: int = 31, offset: int = 15, **_) -> np.ndarray:
+    return cv2.adaptiveThreshold(_grey(image), 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block_size, offset)
+
+
+STAGES = {
+    "crop": crop_document,
+    "resize": resize_to_text_height,
+    "deskew": deskew,
+    "binarize": binarize,
+}
+
+
+def parse_stages(value: str) -> list[str]:
+    stages = [stage.strip() for stage in value.split(",") if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown preprocessing stage(s): {', '.join(sorted(unknown))}")
+    return [stage for stage in STAGES if stage in stages]
+
+
+def decode(image: bytes) -> np.ndarray:
+    decoded = cv2.imdecode(np.frombuffer(image, np.uint8), cv2.IMREAD_COLOR)
+    if decoded is None:
+        raise ValueError("Could not decode image")
+    return decoded
+
+
+def run(image: bytes | np.ndarray, stages: list[str], **options) -> tuple[np.ndarray, dict[str, float]]:
+    """Applies `stages` to an encoded or decoded image. Returns the image and ms spent per stage."""
+    timings = {}
+
+    started = time.perf_counter()
+    if isinstance(image, bytes):
+        image = decode(image)
+    timings["decode"] = (time.perf_counter() - started) * 1000
+
+    for stage in stages:
+        started = time.perf_counter()
+        image = STAGES[stage](image, **options)
+        timings[stage] = (time.perf_counter() - started) * 1000
+
+    return image, timings
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+
+from fastapi import FastAPI, UploadFile, File, status
+from fastapi.responses import JSONResponse
+
+from app.core import lifecycle
+from app.ocr import engine
+
+# Internal app served by the OCR worker tier (see main.py). The public API
+# forwards /api/fuel-receipts/upload here when OCR_SERVICE_URL is set.
+app = FastAPI()
+
+@app.get("/health")
+def health_check():
+    return {
+        "status": "ok",
+        "tier": "ocr",
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+@app.get("/ready")
+def readiness_check():
+    if lifecycle.is_draining():
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "draining", "tier": "ocr"})
+
+    if not engine.is_reader_loaded():
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "loading", "tier": "ocr"})
+
+    return {"status": "ready", "tier": "ocr"}
+
+@app.post("/ocr")
+def perform_ocr(file: UploadFile = File(...)):
+    # Sync endpoint: runs in the threadpool so inference never blocks the event loop
+    return {"text": engine.read_receipt(file.file.read())}
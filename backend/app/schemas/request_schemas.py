@@ -1,8 +1,12 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, EmailStr, Field
+from typing import Annotated, Optional
 import datetime
+import uuid
 from app.models.car import FuelType
 
+# Row ids are native uuid columns, so malformed ids are rejected with a 422 before they reach the database
+Id = Annotated[uuid.UUID, AfterValidator(str)]
+
 class RegisterCredentials(BaseModel):
     email: EmailStr
     firstName: str
@@ -46,7 +50,8 @@ class CreateFuelReceipt(BaseModel):
     volumePurchased: float
     advertisedPrice: float
     odometer: float
-    carId: str
+    carId: Id
+    currency: Optional[str] = Field(default=None, pattern="^[A-Z]{3}$")  # defaults to the user's currency
 
 class UpdateFuelReceipt(BaseModel):
     date: Optional[datetime.date] = None
@@ -54,7 +59,8 @@ class UpdateFuelReceipt(BaseModel):
     volumePurchased: Optional[float] = Field(default=None, alias="volume_purchased")
     advertisedPrice: Optional[float] = Field(default=None, alias="advertised_price")
     odometer: Optional[float] = None
-    carId: Optional[str] = Field(default=None, alias="car_id")
+    carId: Optional[Id] = Field(default=None, alias="car_id")
+    currency: Optional[str] = Field(default=None, pattern="^[A-Z]{3}$")
 
     model_config = {
         "populate_by_name": True,
@@ -52,6 +52,9 @@ class FuelReceiptSchema(BaseModel):
     volume_purchased: float = Field(..., alias="volumePurchased")
     advertised_price: float = Field(..., alias="advertisedPrice")
     odometer: float
+    currency: str
+    amount_paid_normalized: float = Field(..., alias="amountPaidNormalized")
+    advertised_price_normalized: float = Field(..., alias="advertisedPriceNormalized")
     user_id: str = Field(..., alias="userId")
     car_id: str = Field(..., alias="carId")
     created_at: datetime = Field(..., alias="createdAt")
@@ -61,3 +64,24 @@ class FuelReceiptSchema(BaseModel):
         "from_attributes": True,
         "populate_by_name": True,  # allow population via aliases
     }
+
+class FuelReceiptSummarySchema(BaseModel):
+    currency: str
+    receipts: int
+    total_spent: float = Field(..., alias="totalSpent")
+    total_volume: float = Field(..., alias="totalVolume")
+
+    model_config = {
+        "populate_by_name": True,  # allow population via aliases
+    }
+
+class CarPurgeSchema(BaseModel):
+    car_id: str = Field(..., alias="carId")
+    purged_receipts: int = Field(..., alias="purgedReceipts")
+    remaining_receipts: int = Field(..., alias="remainingReceipts")
+    created_at: datetime = Field(..., alias="createdAt")
+    completed_at: Optional[datetime] = Field(None, alias="completedAt")
+
+    model_config = {
+        "populate_by_name": True,  # allow population via aliases
+    }
@@ -0,0 +1,104 @@
+"""Shared helpers for the OCR benchmarks: loading a receipt fixture set and scoring text."""
+import json
+import os
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+
+def load_text_fixtures(fixtures_dir: str):
+    """
+    Yields (name, image_bytes, expected_text) for every image in `fixtures_dir`
+    that has a sibling .txt file holding its ground-truth receipt text.
+    """
+    for filename in sorted(os.listdir(fixtures_dir)):
+        stem, extension = os.path.splitext(filename)
+        if extension.lower() not in IMAGE_EXTENSIONS:
+            continue
+
+        text_path = os.path.join(fixtures_dir, stem + ".txt")
+        if not os.path.exists(text_path):
+            continue
+
+        with open(os.path.join(fixtures_dir, filename), "rb") as image_file:
+            image = image_file.read()
+        with open(text_path, encoding="utf-8") as text_file:
+            expected = text_file.read().strip()
+
+        yield stem, image, expected
+
+
+def edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def char_accuracy(predicted: str, expected: str) -> float:
+    """1 - character error rate, floored at 0. Whitespace runs are collapsed first."""
+    predicted = " ".join(predicted.split())
+    expected = " ".join(expected.split())
+    if not expected:
+        return 1.0 if not predicted else 0.0
+    return max(0.0, 1 - edit_distance(predicted, expected) / len(expected))
+
+
+def line_accuracy(predicted: str, expected: str) -> float:
+    """Fraction of expected lines reproduced exactly (ignoring spacing) as a line of the prediction."""
+    predicted_lines = {" ".join(line.split()) for line in predicted.splitlines()}
+    expected_lines = [" ".join(line.split()) for line in expected.splitlines() if line.strip()]
+    if not expected_lines:
+        return 1.0
+    return sum(line in predicted_lines for line in expected_lines) / len(expected_lines)
+
+
+def _field_name(label: str) -> str | None:
+    # Accepts plain ("TOTAL") and BIO-tagged ("B-TOTAL", "I-TOTAL") labels; "O" is outside any field
+    if label.upper() == "O":
+        return None
+    if label[:2].upper() in ("B-", "I-"):
+        label = label[2:]
+    return label.lower()
+
+
+def load_doccano_fixtures(jsonl_path: str, images_dir: str | None = None):
+    """
+    Yields (name, image_bytes, fields) for each annotated record of a Doccano
+    JSONL export in the format machine_learning/ml_training/
+    receipt_ocr_processing_script.py writes: "words" with one label each in
+    "labels". `fields` maps each labelled field (lowercased, BIO prefix
+    dropped) to its words joined in reading order.
+
+    The image is the record's "image" path, else `<id>.<png|jpg|jpeg>`, both
+    relative to `images_dir` (default: the JSONL file's directory). Records
+    without any field label are skipped.
+    """
+    base_dir = images_dir or os.path.dirname(os.path.abspath(jsonl_path))
+    with open(jsonl_path, encoding="utf-8") as jsonl_file:
+        records = [json.loads(line) for line in jsonl_file if line.strip()]
+
+    for record in records:
+        fields = {}
+        for word, label in zip(record["words"], record["labels"]):
+            field = _field_name(label)
+            if field:
+                fields.setdefault(field, []).append(word)
+        if not fields:
+            continue
+
+        candidates = [record["image"]] if record.get("image") else [record["id"] + extension for extension in IMAGE_EXTENSIONS]
+        image_path = next((os.path.join(base_dir, path) for path in candidates if os.path.exists(os.path.join(base_dir, path))), None)
+        if image_path is None:
+            raise FileNotFoundError(f"No image for Doccano record {record['id']} next to {jsonl_path}")
+
+        with open(image_path, "rb") as image_file:
+            yield record["id"], image_file.read(), {field: " ".join(words) for field, words in fields.items()}
+
+
+def field_matches(predicted: str, fields: dict[str, str]) -> dict[str, bool]:
+    """Per field: whether its value appears (case and spacing ignored) within a single line of the prediction."""
+    predicted_lines = [" ".join(line.split()).lower() for line in predicted.splitlines()]
+    return {field: any(" ".join(value.split()).lower() in line for line in predicted_lines) for field, value in fields.items()}
@@ -0,0 +1,81 @@
+"""
+Compares OCR backends on a receipt fixture set: model load time, latency per
+receipt, peak RSS and text accuracy of reconstruct_receipt_text's output.
+
+Fixtures are images with a sibling .txt holding the expected receipt text
+(see benchmarks/fixtures.py). Each backend runs in its own process so peak
+RSS isn't shared between them.
+
+Usage (from backend/):
+    python -m benchmarks.ocr_backends path/to/fixtures --backends easyocr onnx --onnx-dir models/onnx
+"""
+import argparse
+import multiprocessing
+import resource
+import statistics
+import time
+
+from benchmarks.fixtures import char_accuracy, line_accuracy, load_text_fixtures
+
+
+def _run(backend_name: str, fixtures_dir: str, onnx_dir: str, threads: int, warmup: int) -> dict:
+    import torch
+
+    from app.ocr.backends import EasyOCRBackend, OnnxBackend
+    from app.ocr.engine import reconstruct_receipt_text
+
+    torch.set_num_threads(threads)
+    fixtures = list(load_text_fixtures(fixtures_dir))
+
+    started = time.perf_counter()
+    # Constructed directly: the engine's silent fallback would hide a broken ONNX export here
+    backend = OnnxBackend(onnx_dir, threads) if backend_name == "onnx" else EasyOCRBackend()
+    load_s = time.perf_counter() - started
+
+    for _, image, _ in fixtures[:warmup]:
+        backend.readtext(image)
+
+    latencies, char_scores, line_scores = [], [], []
+    for _, image, expected in fixtures:
+        started = time.perf_counter()
+        text = reconstruct_receipt_text(backend.readtext(image))
+        latencies.append((time.perf_counter() - started) * 1000)
+        char_scores.append(char_accuracy(text, expected))
+        line_scores.append(line_accuracy(text, expected))
+
+    return {
+        "backend": backend_name,
+        "receipts": len(fixtures),
+        "load_s": load_s,
+        "median_ms": statistics.median(latencies),
+        "p95_ms": sorted(latencies)[max(0, int(len(latencies) * 0.95) - 1)],
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "char_accuracy": statistics.mean(char_scores),
+        "line_accuracy": statistics.mean(line_scores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures_dir")
+    parser.add_argument("--backends", nargs="+", default=["easyocr", "onnx"], choices=["easyocr", "onnx"])
+    parser.add_argument("--onnx-dir", default="models/onnx")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=1, help="fixtures read once before timing")
+    args = parser.parse_args()
+
+    # spawn, not fork: each backend gets a clean interpreter and its own peak RSS
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    for backend_name in args.backends:
+        with context.Pool(1) as pool:
+            rows.append(pool.apply(_run, (backend_name, args.fixtures_dir, args.onnx_dir, args.threads, args.warmup)))
+
+    print(f"{'backend':<10} {'receipts':>8} {'load s':>8} {'median ms':>10} {'p95 ms':>10} {'peak MB':>9} {'char acc':>9} {'line acc':>9}")
+    for row in rows:
+        print(f"{row['backend']:<10} {row['receipts']:>8} {row['load_s']:>8.2f} {row['median_ms']:>10.1f} {row['p95_ms']:>10.1f} {row['peak_rss_mb']:>9.0f} {row['char_accuracy']:>9.3f} {row['line_accuracy']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
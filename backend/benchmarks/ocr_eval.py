@@ -0,0 +1,205 @@
+"""
+Offline evaluation of the OCR pipeline (preprocessing, backend readtext,
+reconstruct_receipt_text) on a labelled fixture set, sweeping configurations
+and reporting field accuracy against ms/receipt and peak RSS.
+
+Fixtures are a Doccano JSONL export of what
+machine_learning/ml_training/receipt_ocr_processing_script.py writes, with
+the field words labelled (TOTAL, LITRES, ... or B-/I- tagged; see
+load_doccano_fixtures in benchmarks/fixtures.py). A field counts as right
+when its labelled words appear within one line of the reconstructed text.
+
+The sweep is every combination of --models, --text-heights (the resize
+stage's target, "none" to skip it) and --y-tolerances. Each model and text
+height runs in a fresh process, --jobs at a time, so peak RSS is per
+configuration; the y tolerances reuse that process's OCR results since they
+only change reconstruct_receipt_text. Configurations on the Pareto front
+(no other one is at least as accurate, fast and small) are marked with *.
+
+As a CI regression check, save a baseline on the CI machine once and
+compare later runs against it. The exit status is 1 when a configuration
+in both lost more than --max-accuracy-drop of field accuracy, or grew
+more than --max-slowdown in ms/receipt or --max-rss-growth in peak RSS.
+
+Usage (from backend/):
+    python -m benchmarks.ocr_eval fixtures/receipts.jsonl
+    python -m benchmarks.ocr_eval fixtures/receipts.jsonl --models easyocr easyocr-fp32 onnx --text-heights none 24 32 --y-tolerances 5 10 15
+    python -m benchmarks.ocr_eval fixtures/receipts.jsonl --save-baseline ocr_baseline.json
+    python -m benchmarks.ocr_eval fixtures/receipts.jsonl --baseline ocr_baseline.json --max-slowdown 0.5
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+from benchmarks.fixtures import field_matches, load_doccano_fixtures
+
+MODELS = ["easyocr", "easyocr-fp32", "onnx"]
+
+
+def _config_name(model: str, text_height: int | None, y_tolerance: int) -> str:
+    return f"{model} height={text_height or 'none'} y={y_tolerance}"
+
+
+def _load_backend(model: str, onnx_dir: str, threads: int):
+    from app.ocr.backends import EasyOCRBackend, OnnxBackend
+
+    # Constructed directly: the engine's silent fallback would score EasyOCR under the onnx name
+    if model == "onnx":
+        return OnnxBackend(onnx_dir, threads)
+    return EasyOCRBackend(quantize=model != "easyocr-fp32")
+
+
+def _run(task: dict) -> list[dict]:
+    """Evaluates one model and text height at every y tolerance. Runs in its own process."""
+    import torch
+
+    from app.ocr import preprocess
+    from app.ocr.engine import reconstruct_receipt_text
+
+    torch.set_num_threads(task["threads"])
+    fixtures = list(load_doccano_fixtures(task["fixtures"], task["images_dir"]))
+    backend = _load_backend(task["model"], task["onnx_dir"], task["threads"])
+    stages = preprocess.parse_stages(",".join(task["stages"] + (["resize"] if task["text_height"] else [])))
+
+    def read(image):
+        if stages:
+            image, _ = preprocess.run(image, stages, target_text_height=task["text_height"])
+        return backend.readtext(image)
+
+    for _, image, _ in fixtures[:task["warmup"]]:
+        read(image)
+
+    results, elapsed = [], 0.0
+    for _, image, _ in fixtures:
+        started = time.perf_counter()
+        results.append(read(image))
+        elapsed += time.perf_counter() - started
+
+    rows = []
+    for y_tolerance in task["y_tolerances"]:
+        hits = {}
+        for result, (_, _, fields) in zip(results, fixtures):
+            text = reconstruct_receipt_text(result, y_tolerance=y_tolerance)
+            for field, matched in field_matches(text, fields).items():
+                hits.setdefault(field, []).append(matched)
+
+        total = sum(len(matches) for matches in hits.values())
+        rows.append({
+            "config": _config_name(task["model"], task["text_height"], y_tolerance),
+            "receipts": len(fixtures),
+            "field_accuracy": sum(sum(matches) for matches in hits.values()) / total if total else 0.0,
+            "fields": {field: sum(matches) / len(matches) for field, matches in sorted(hits.items())},
+            # Reconstruction is sub-millisecond, so rows differing only in y tolerance share the OCR time and tie on it
+            "ms_per_receipt": elapsed * 1000 / len(fixtures) if fixtures else 0.0,
+            # ru_maxrss is in KiB on Linux
+            "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        })
+    return rows
+
+
+def _pareto(rows: list[dict]) -> set[str]:
+    def dominates(a, b):
+        at_least = a["field_accuracy"] >= b["field_accuracy"] and a["ms_per_receipt"] <= b["ms_per_receipt"] and a["peak_rss_mb"] <= b["peak_rss_mb"]
+        better = a["field_accuracy"] > b["field_accuracy"] or a["ms_per_receipt"] < b["ms_per_receipt"] or a["peak_rss_mb"] < b["peak_rss_mb"]
+        return at_least and better
+
+    return {row["config"] for row in rows if not any(dominates(other, row) for other in rows)}
+
+
+def _regressions(rows: list[dict], baseline: dict, args) -> list[str]:
+    failures = []
+    for row in rows:
+        before = baseline.get(row["config"])
+        if before is None:
+            continue
+        if row["field_accuracy"] < before["field_accuracy"] - args.max_accuracy_drop:
+            failures.append(f"{row['config']}: field accuracy {before['field_accuracy']:.3f} -> {row['field_accuracy']:.3f}")
+        if row["ms_per_receipt"] > before["ms_per_receipt"] * (1 + args.max_slowdown):
+            failures.append(f"{row['config']}: {before['ms_per_receipt']:.1f} -> {row['ms_per_receipt']:.1f} ms/receipt")
+        if row["peak_rss_mb"] > before["peak_rss_mb"] * (1 + args.max_rss_growth):
+            failures.append(f"{row['config']}: peak RSS {before['peak_rss_mb']:.0f} -> {row['peak_rss_mb']:.0f} MB")
+    return failures
+
+
+def _text_height(value: str) -> int | None:
+    return None if value == "none" else int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", help="Doccano JSONL file")
+    parser.add_argument("--images-dir", default=None, help="where the records' images are (default: next to the JSONL file)")
+    parser.add_argument("--models", nargs="+", default=["easyocr"], choices=MODELS)
+    parser.add_argument("--onnx-dir", default="models/onnx")
+    parser.add_argument("--text-heights", nargs="+", type=_text_height, default=[None, 32], help='resize targets in px, "none" for no resize')
+    parser.add_argument("--y-tolerances", nargs="+", type=int, default=[5, 10, 15])
+    parser.add_argument("--stages", default="", help="preprocessing stages applied in every configuration besides resize, e.g. crop,deskew")
+    parser.add_argument("--threads", type=int, default=1, help="torch threads per configuration")
+    parser.add_argument("--jobs", type=int, default=None, help="configurations run at once (default: cores / threads)")
+    parser.add_argument("--warmup", type=int, default=1, help="fixtures read once per configuration before timing")
+    parser.add_argument("--json", default=None, help="also write every row, per-field accuracy included, to this file")
+    parser.add_argument("--save-baseline", default=None, help="write this run's results as the baseline for --baseline")
+    parser.add_argument("--baseline", default=None, help="compare against a saved baseline and exit 1 on regressions")
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.01)
+    parser.add_argument("--max-slowdown", type=float, default=0.25, help="allowed ms/receipt growth as a fraction")
+    parser.add_argument("--max-rss-growth", type=float, default=0.10, help="allowed peak RSS growth as a fraction")
+    args = parser.parse_args()
+
+    from app.ocr import preprocess
+
+    try:
+        stages = preprocess.parse_stages(args.stages)
+    except ValueError as error:
+        parser.error(str(error))
+    if "resize" in stages:
+        parser.error("resize is swept with --text-heights, leave it out of --stages")
+
+    tasks = [{
+        "fixtures": args.fixtures, "images_dir": args.images_dir, "model": model, "text_height": text_height,
+        "y_tolerances": args.y_tolerances, "stages": stages, "onnx_dir": args.onnx_dir, "threads": args.threads, "warmup": args.warmup,
+    } for model in args.models for text_height in args.text_heights]
+    jobs = args.jobs or max(1, (os.cpu_count() or 1) // args.threads)
+
+    # spawn, one task per process: every configuration starts from a clean interpreter and gets its own peak RSS
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    with context.Pool(min(jobs, len(tasks)), maxtasksperchild=1) as pool:
+        for task_rows in pool.imap_unordered(_run, tasks):
+            rows.extend(task_rows)
+
+    rows.sort(key=lambda row: (row["ms_per_receipt"], -row["field_accuracy"]))
+    front = _pareto(rows)
+    receipts = rows[0]["receipts"] if rows else 0
+    print(f"{receipts} receipts, {len(rows)} configurations, {min(jobs, len(tasks))} at a time")
+    print(f"{'':<2}{'configuration':<36} {'field acc':>9} {'ms/receipt':>11} {'peak MB':>8}   per field")
+    for row in rows:
+        per_field = ", ".join(f"{field}={accuracy:.2f}" for field, accuracy in row["fields"].items())
+        marker = "*" if row["config"] in front else ""
+        print(f"{marker:<2}{row['config']:<36} {row['field_accuracy']:>9.3f} {row['ms_per_receipt']:>11.1f} {row['peak_rss_mb']:>8.0f}   {per_field}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(rows, json_file, indent=2)
+
+    if args.save_baseline:
+        baseline = {row["config"]: {key: row[key] for key in ("field_accuracy", "ms_per_receipt", "peak_rss_mb")} for row in rows}
+        with open(args.save_baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            failures = _regressions(rows, json.load(baseline_file), args)
+        if failures:
+            print(f"\n{len(failures)} regression(s) against {args.baseline}:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
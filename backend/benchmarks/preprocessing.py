@@ -0,0 +1,83 @@
+"""
+Before/after report for the OCR preprocessing stages (app/ocr/preprocess.py).
+
+For each stage configuration, runs every fixture through the stages and the
+OCR backend and reports the time spent per stage, the inference time, and the
+accuracy of reconstruct_receipt_text's output against the expected text. An
+empty configuration ("none") is the baseline without preprocessing.
+
+Fixtures are images with a sibling .txt holding the expected receipt text
+(see benchmarks/fixtures.py).
+
+Usage (from backend/):
+    python -m benchmarks.preprocessing path/to/fixtures
+    python -m benchmarks.preprocessing path/to/fixtures --configs none resize crop,resize,deskew --backend onnx
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.fixtures import char_accuracy, line_accuracy, load_text_fixtures
+
+
+def _run(backend, fixtures: list, stages: list[str], target_text_height: int, warmup: int) -> dict:
+    from app.ocr import preprocess
+    from app.ocr.engine import reconstruct_receipt_text
+
+    for _, image, _ in fixtures[:warmup]:
+        backend.readtext(preprocess.run(image, stages, target_text_height=target_text_height)[0])
+
+    stage_ms = {stage: [] for stage in ["decode", *stages]}
+    inference_ms, char_scores, line_scores = [], [], []
+    for _, image, expected in fixtures:
+        processed, timings = preprocess.run(image, stages, target_text_height=target_text_height)
+        for stage, ms in timings.items():
+            stage_ms[stage].append(ms)
+
+        started = time.perf_counter()
+        result = backend.readtext(processed)
+        inference_ms.append((time.perf_counter() - started) * 1000)
+
+        text = reconstruct_receipt_text(result)
+        char_scores.append(char_accuracy(text, expected))
+        line_scores.append(line_accuracy(text, expected))
+
+    return {
+        "stage_ms": {stage: statistics.median(values) for stage, values in stage_ms.items()},
+        "inference_ms": statistics.median(inference_ms),
+        "char_accuracy": statistics.mean(char_scores),
+        "line_accuracy": statistics.mean(line_scores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures_dir")
+    parser.add_argument("--configs", nargs="+", default=["none", "resize", "crop,resize,deskew", "crop,resize,deskew,binarize"], help='comma separated stage lists; "none" for no preprocessing')
+    parser.add_argument("--backend", default="easyocr", choices=["easyocr", "onnx"])
+    parser.add_argument("--onnx-dir", default="models/onnx")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--target-text-height", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=1, help="fixtures read once per configuration before timing")
+    args = parser.parse_args()
+
+    import torch
+
+    from app.ocr import preprocess
+    from app.ocr.backends import EasyOCRBackend, OnnxBackend
+
+    torch.set_num_threads(args.threads)
+    fixtures = list(load_text_fixtures(args.fixtures_dir))
+    backend = OnnxBackend(args.onnx_dir, args.threads) if args.backend == "onnx" else EasyOCRBackend()
+
+    print(f"{'stages':<30} {'prep ms':>8} {'infer ms':>9} {'total ms':>9} {'char acc':>9} {'line acc':>9}   per stage (median ms)")
+    for config in args.configs:
+        stages = [] if config == "none" else preprocess.parse_stages(config)
+        row = _run(backend, fixtures, stages, args.target_text_height, args.warmup)
+        prep_ms = sum(row["stage_ms"].values())
+        per_stage = ", ".join(f"{stage}={ms:.1f}" for stage, ms in row["stage_ms"].items())
+        print(f"{config:<30} {prep_ms:>8.1f} {row['inference_ms']:>9.1f} {prep_ms + row['inference_ms']:>9.1f} {row['char_accuracy']:>9.3f} {row['line_accuracy']:>9.3f}   {per_stage}")
+
+
+if __name__ == "__main__":
+    main()
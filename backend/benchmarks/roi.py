@@ -0,0 +1,79 @@
+"""
+Per-receipt comparison of full-read OCR (every detected box recognized) and
+region-of-interest OCR (app/ocr/roi.py: only the total/litres/price/date lines).
+
+For each fixture prints both latencies, the detect/recognize split of the ROI
+read, how many boxes it recognized, and "field lines": the share of expected
+lines that mention one of the fields which each mode reproduced exactly.
+
+Fixtures are images with a sibling .txt holding the expected receipt text
+(see benchmarks/fixtures.py).
+
+Usage (from backend/):
+    python -m benchmarks.roi path/to/fixtures
+    python -m benchmarks.roi path/to/fixtures --backend onnx --onnx-dir models/onnx
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.fixtures import line_accuracy, load_text_fixtures
+
+
+def _field_lines(expected: str) -> str:
+    from app.ocr.roi import matched_fields
+    return "\n".join(line for line in expected.splitlines() if matched_fields(line))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures_dir")
+    parser.add_argument("--backend", default="easyocr", choices=["easyocr", "onnx"])
+    parser.add_argument("--onnx-dir", default="models/onnx")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=1, help="fixtures read once in both modes before timing")
+    args = parser.parse_args()
+
+    import torch
+
+    from app.ocr import roi
+    from app.ocr.backends import EasyOCRBackend, OnnxBackend
+    from app.ocr.engine import reconstruct_receipt_text
+
+    torch.set_num_threads(args.threads)
+    fixtures = list(load_text_fixtures(args.fixtures_dir))
+    backend = OnnxBackend(args.onnx_dir, args.threads) if args.backend == "onnx" else EasyOCRBackend()
+
+    for _, image, _ in fixtures[:args.warmup]:
+        backend.readtext(image)
+        roi.readtext(backend, image)
+
+    print(f"{'receipt':<24} {'full ms':>9} {'roi ms':>9} {'detect':>8} {'recog':>8} {'speedup':>8} {'boxes':>9} {'full fields':>12} {'roi fields':>11}")
+    full_latencies, roi_latencies, full_scores, roi_scores = [], [], [], []
+    for name, image, expected in fixtures:
+        started = time.perf_counter()
+        full_text = reconstruct_receipt_text(backend.readtext(image))
+        full_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        result, stats = roi.readtext(backend, image)
+        roi_text = reconstruct_receipt_text(result)
+        roi_ms = (time.perf_counter() - started) * 1000
+
+        field_lines = _field_lines(expected)
+        full_score, roi_score = line_accuracy(full_text, field_lines), line_accuracy(roi_text, field_lines)
+        full_latencies.append(full_ms)
+        roi_latencies.append(roi_ms)
+        full_scores.append(full_score)
+        roi_scores.append(roi_score)
+
+        boxes = f"{stats['recognized']}/{stats['boxes']}"
+        print(f"{name[:24]:<24} {full_ms:>9.1f} {roi_ms:>9.1f} {stats['detect_ms']:>8.1f} {stats['recognize_ms']:>8.1f} {full_ms / roi_ms:>7.2f}x {boxes:>9} {full_score:>12.3f} {roi_score:>11.3f}")
+
+    if fixtures:
+        full_median, roi_median = statistics.median(full_latencies), statistics.median(roi_latencies)
+        print(f"{'median / mean':<24} {full_median:>9.1f} {roi_median:>9.1f} {'':>8} {'':>8} {full_median / roi_median:>7.2f}x {'':>9} {statistics.mean(full_scores):>12.3f} {statistics.mean(roi_scores):>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Startup cost report and regression check.
+
+Measures, in fresh interpreters:
+- import time of `app.main` from `python -X importtime`, with the slowest modules;
+- import time of what alembic's env.py loads (settings + models);
+- time from launching uvicorn to the first 200 from GET /api/health (needs a database).
+
+Exits non-zero when a budget is exceeded or when a module that should only be
+loaded lazily (torch, easyocr, passlib, jose) is imported by `app.main`, so
+the same script can run in CI.
+
+Usage (from backend/):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --skip-server --max-import-ms 800
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+LAZY_MODULES = ("torch", "easyocr", "passlib", "jose")
+
+
+def measure_imports(statement: str):
+    """Returns (total_ms, {module: cumulative_ms}) for running `statement` in a fresh interpreter."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"`{statement}` failed:\n{completed.stderr}")
+
+    modules = {}
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name[1:].rstrip()] = int(cumulative) / 1000
+
+    # Nested imports are indented; the top-level entries add up to the total
+    total = sum(ms for name, ms in modules.items() if not name.startswith(" "))
+    return total, modules
+
+
+def measure_first_healthy_response(port: int, timeout: float) -> float | None:
+    """Returns ms until GET /api/health first answers 200, or None on timeout."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "--factory", "app.main:create_app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            time.sleep(0.02)
+        return None
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="number of slowest modules to list")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="fail if importing app.main takes longer")
+    parser.add_argument("--max-startup-ms", type=float, default=None, help="fail if the first healthy response takes longer")
+    parser.add_argument("--skip-server", action="store_true", help="only measure imports (no database needed)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    failures = []
+
+    app_total, app_modules = measure_imports("import app.main")
+    print(f"import app.main: {app_total:.1f} ms")
+    for name, ms in sorted(app_modules.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {ms:9.1f} ms  {name.strip()}")
+
+    loaded_lazy = sorted({name.strip().split(".")[0] for name in app_modules} & set(LAZY_MODULES))
+    if loaded_lazy:
+        failures.append(f"app.main imports modules that should load lazily: {', '.join(loaded_lazy)}")
+
+    migrations_total, _ = measure_imports("import app.core.config, app.db.base")
+    print(f"import for migrations (settings + models): {migrations_total:.1f} ms")
+
+    if args.max_import_ms is not None and app_total > args.max_import_ms:
+        failures.append(f"import app.main took {app_total:.1f} ms (budget {args.max_import_ms:.1f} ms)")
+
+    if not args.skip_server:
+        startup_ms = measure_first_healthy_response(args.port, args.timeout)
+        if startup_ms is None:
+            failures.append(f"no healthy response from /api/health within {args.timeout:.0f}s")
+        else:
+            print(f"time to first healthy response: {startup_ms:.1f} ms")
+            if args.max_startup_ms is not None and startup_ms > args.max_startup_ms:
+                failures.append(f"first healthy response took {startup_ms:.1f} ms (budget {args.max_startup_ms:.1f} ms)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
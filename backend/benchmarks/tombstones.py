@@ -0,0 +1,86 @@
+"""
+Cost of hiding deleted cars' receipts from receipt list queries.
+
+Seeds a database with one user owning `--cars` cars of `--receipts-per-car`
+receipts each, tombstones `--deleted` of them (as DELETE /api/cars/{id}
+does, before the purge worker runs) and compares the median time of the
+receipt list query with and without the tombstone filter.
+
+Runs against a throwaway SQLite file by default; pass --database-url to
+use an empty Postgres database instead (its tables are created and left
+in place).
+
+Usage (from backend/):
+    python -m benchmarks.tombstones
+    python -m benchmarks.tombstones --cars 20 --receipts-per-car 5000 --deleted 5
+"""
+import argparse
+import datetime
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+
+def _median_ms(query, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        query.all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--cars", type=int, default=10)
+    parser.add_argument("--receipts-per-car", type=int, default=2000)
+    parser.add_argument("--deleted", type=int, default=3, help="cars tombstoned but not purged yet")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from sqlalchemy.sql import func
+
+    from app.api.fuel_receipts import visible_receipts
+    from app.db.base import Base, Car, FuelReceipt, User
+    from app.db.ids import uuid7
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'tombstones.db')}"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x", first_name="Bench", last_name="Mark", currency="USD")
+        db.add(user)
+        db.flush()
+        cars = [Car(user_id=user.id, name=f"car {index}", make="make", model="model", year=2020, is_default=False) for index in range(args.cars)]
+        db.add_all(cars)
+        db.flush()
+        db.execute(FuelReceipt.__table__.insert(), [
+            {"id": uuid7(), "date": datetime.date(2024, 1, 1), "amount_paid": 50, "volume_purchased": 30, "advertised_price": 1.7, "odometer": index, "currency": "USD", "amount_paid_normalized": 50, "advertised_price_normalized": 1.7, "user_id": user.id, "car_id": car.id}
+            for car in cars for index in range(args.receipts_per_car)
+        ])
+        db.commit()
+
+        # Same rows either way, so the difference is the filter itself
+        plain_ms = _median_ms(db.query(FuelReceipt).filter(FuelReceipt.user_id == user.id), args.runs)
+        filtered_ms = _median_ms(visible_receipts(db, user.id), args.runs)
+
+        for car in cars[:args.deleted]:
+            car.deleted_at = func.now()
+        db.commit()
+        tombstoned_ms = _median_ms(visible_receipts(db, user.id), args.runs)
+        visible_rows = visible_receipts(db, user.id).count()
+
+    print(f"receipts: {args.cars * args.receipts_per_car}")
+    print(f"list, no tombstone filter:            {plain_ms:9.1f} ms")
+    print(f"list, tombstone filter, none deleted: {filtered_ms:9.1f} ms ({(filtered_ms / plain_ms - 1) * 100:+.1f}%)")
+    print(f"list, {args.deleted} of {args.cars} cars tombstoned:      {tombstoned_ms:9.1f} ms ({visible_rows} rows visible)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,43 @@
+import argparse
+
+from app.core.config import get_settings
+from app.core.server import Supervisor, WorkerPool
+
+
 def main():
-    print("Hello from backend!")
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run the CarCost backend in production")
+    parser.add_argument("--tier", choices=["all", "api", "ocr"], default="all", help="which worker tier(s) to run")
+    parser.add_argument("--api-workers", type=int, default=settings.API_WORKERS)
+    parser.add_argument("--ocr-workers", type=int, default=settings.OCR_WORKERS)
+    args = parser.parse_args()
+
+    pools = []
+
+    if args.tier in ("all", "ocr"):
+        from app.ocr import engine
+        from app.ocr_main import app as ocr_app
+
+        # Load the model weights once; forked workers share them copy-on-write
+        engine.get_reader()
+        pools.append(WorkerPool("ocr", ocr_app, settings.OCR_HOST, settings.OCR_PORT, args.ocr_workers, on_fork=engine.configure_worker))
+
+    if args.tier in ("all", "api"):
+        if args.tier == "all" and not settings.OCR_SERVICE_URL:
+            settings.OCR_SERVICE_URL = f"http://{settings.OCR_HOST}:{settings.OCR_PORT}"
+
+        from app.db.session import dispose_engines
+        from app.main import create_app, preload, warn_about_per_worker_state
+
+        # Workers read it to tell clients whether events reach them from every worker
+        settings.API_WORKERS = args.api_workers
+        warn_about_per_worker_state(args.api_workers)
+        api_app = create_app()
+        preload()
+        # Connections must never be shared across processes
+        pools.append(WorkerPool("api", api_app, settings.HOST, settings.PORT, args.api_workers, on_fork=dispose_engines))
+
+    Supervisor(pools, settings.DRAIN_SECONDS, settings.GRACEFUL_TIMEOUT).run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import uuid
+
+# Settings are read on first use, so these only need to be in place before the first test runs
+_database = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.update({
+    "DB_HOST": "localhost", "DB_PORT": "5432", "DB_NAME": "carcost", "DB_USER": "carcost", "DB_PASSWORD": "carcost",
+    "SECRET_KEY": "test-secret", "ALGORITHM": "HS256", "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "PRIMARY_DATABASE_URL": f"sqlite:///{_database}",
+    "RATE_LIMIT_ENABLED": "false",
+})
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import events, fx, idempotency, rate_limit
+from app.core.config import get_settings
+from app.db import session
+from app.db.base import Base
+from app.main import create_app
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """The app's settings; tests change them with monkeypatch.setattr(settings, ...)."""
+    return get_settings()
+
+
+@pytest.fixture(autouse=True)
+def database():
+    engine = session.get_engine()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    # Per-process stores that would otherwise leak between tests
+    for cached in (rate_limit.get_backend, idempotency.get_store, events.get_broker):
+        cached.cache_clear()
+    rate_limit.counters.clear()
+    fx.rates.clear()
+    yield
+
+
+@pytest.fixture
+def client():
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def register(client):
+    """Registers a new user and returns the auth response (access_token, user)."""
+    def register_user(email: str | None = None) -> dict:
+        response = client.post("/api/auth/register", json={
+            "email": email or f"{uuid.uuid4().hex[:12]}@example.com", "firstName": "Test", "lastName": "User", "password": "password123",
+        })
+        assert response.status_code == 200, response.text
+        return response.json()
+    return register_user
+
+
+@pytest.fixture
+def auth(register) -> dict:
+    """Authorization headers for a freshly registered user."""
+    return {"Authorization": f"Bearer {register()['access_token']}"}
+
+
+@pytest.fixture
+def car(client, auth) -> dict:
+    response = client.post("/api/cars", json={"name": "Daily", "make": "Mazda", "model": "3", "year": 2020, "fuelType": "petrol", "isDefault": True}, headers=auth)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def receipt(car) -> dict:
+    """Request body for a receipt on `car`."""
+    return {"date": "2024-03-01", "amountPaid": 50, "volumePurchased": 30, "advertisedPrice": 1.7, "odometer": 1000, "carId": car["id"]}
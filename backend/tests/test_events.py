@@ -0,0 +1,191 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app import main
+from app.api import events as events_api
+from app.api import fuel_receipts
+from app.core import events
+
+
+def _ticket(client, auth) -> str:
+    response = client.post("/api/events/ticket", headers=auth)
+    assert response.status_code == 200
+    assert response.json()["expiresIn"] > 0
+    return response.json()["ticket"]
+
+
+def test_ticket_needs_authentication(client):
+    assert client.post("/api/events/ticket").status_code == 401
+
+
+def test_tickets_are_single_use(client, auth):
+    # The stream itself never ends, and TestClient reads whole responses, so this checks the authentication step
+    ticket = _ticket(client, auth)
+
+    assert events_api._authenticate(ticket)
+    with pytest.raises(HTTPException) as error:
+        events_api._authenticate(ticket)
+    assert error.value.status_code == 401
+
+
+def test_stream_rejects_access_tokens(client, auth):
+    access_token = auth["Authorization"].removeprefix("Bearer ")
+
+    assert client.get("/api/events", params={"ticket": access_token}).status_code == 401
+    assert client.get("/api/events", params={"access_token": access_token}).status_code == 422
+
+
+def test_tickets_are_not_access_tokens(client, auth):
+    ticket = _ticket(client, auth)
+
+    assert client.get("/api/cars", headers={"Authorization": f"Bearer {ticket}"}).status_code == 401
+
+
+@pytest.fixture
+def published(monkeypatch):
+    published = []
+    monkeypatch.setattr(events, "publish", lambda user_id, event_type, data=None: published.append((event_type, data)))
+    return published
+
+
+@pytest.fixture
+def slow_ocr(monkeypatch):
+    """OCR that doesn't finish until the returned event is set."""
+    finish = threading.Event()
+
+    async def read_receipt(image, filename):
+        from starlette.concurrency import run_in_threadpool
+
+        await run_in_threadpool(finish.wait, 5)
+        return "TOTAL 50.00"
+
+    monkeypatch.setattr(fuel_receipts, "_read_receipt", read_receipt)
+    return finish
+
+
+def _wait_for_jobs():
+    deadline = time.monotonic() + 5
+    while fuel_receipts._ocr_jobs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not fuel_receipts._ocr_jobs
+
+
+def test_ocr_job_holds_its_concurrency_slot_until_done(client, auth, settings, monkeypatch, published, slow_ocr):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_OCR_CONCURRENCY", 1)
+    upload = {"file": ("receipt.jpg", b"image", "image/jpeg")}
+
+    job = client.post("/api/fuel-receipts/upload/jobs", files=upload, headers=auth)
+    assert job.status_code == 202
+    assert client.post("/api/fuel-receipts/upload/jobs", files=upload, headers=auth).status_code == 429
+    assert client.post("/api/fuel-receipts/upload", files=upload, headers=auth).status_code == 429
+
+    slow_ocr.set()
+    _wait_for_jobs()
+    assert published == [("ocr.completed", {"jobId": job.json()["jobId"], "text": "TOTAL 50.00"})]
+    assert client.post("/api/fuel-receipts/upload/jobs", files=upload, headers=auth).status_code == 202
+    _wait_for_jobs()
+
+
+def test_failed_ocr_job_publishes_and_frees_its_slot(client, auth, settings, monkeypatch, published):
+    async def read_receipt(image, filename):
+        raise RuntimeError("model crashed")
+
+    monkeypatch.setattr(fuel_receipts, "_read_receipt", read_receipt)
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_OCR_CONCURRENCY", 1)
+    upload = {"file": ("receipt.jpg", b"image", "image/jpeg")}
+
+    for _ in range(2):
+        job = client.post("/api/fuel-receipts/upload/jobs", files=upload, headers=auth)
+        assert job.status_code == 202
+        _wait_for_jobs()
+        assert published[-1] == ("ocr.failed", {"jobId": job.json()["jobId"], "detail": "OCR failed"})
+
+
+class SharedBroker(events.LocalBroker):
+    """One in-process broker standing in for Redis: every worker publishes and subscribes through it."""
+
+    shared = True
+
+
+def _upload_like_the_frontend(client, auth, broker) -> str:
+    """Uses a job only when the stream's ticket says it sees every worker's events, like uploadReceiptForOCR."""
+    upload = {"file": ("receipt.jpg", b"image", "image/jpeg")}
+    user_id = client.get("/api/auth/me", headers=auth).json()["id"]
+
+    async def open_stream():
+        return broker.subscribe(user_id)
+
+    # The stream's subscription lives on the test client's event loop, like a real SSE connection
+    subscription = client.portal.call(open_stream)
+    try:
+        if not client.post("/api/events/ticket", headers=auth).json()["crossWorker"]:
+            return client.post("/api/fuel-receipts/upload", files=upload, headers=auth).json()["text"]
+
+        job_id = client.post("/api/fuel-receipts/upload/jobs", files=upload, headers=auth).json()["jobId"]
+        _wait_for_jobs()
+        event = client.portal.call(subscription.queue.get)
+        assert event["type"] == "ocr.completed" and event["data"]["jobId"] == job_id
+        return event["data"]["text"]
+    finally:
+        broker.unsubscribe(user_id, subscription)
+
+
+@pytest.fixture
+def instant_ocr(monkeypatch):
+    async def read_receipt(image, filename):
+        return "TOTAL 50.00"
+
+    monkeypatch.setattr(fuel_receipts, "_read_receipt", read_receipt)
+
+
+def test_job_result_reaches_the_client_with_a_broker_per_worker(client, auth, settings, monkeypatch, instant_ocr):
+    monkeypatch.setattr(settings, "API_WORKERS", 2)
+    worker_a, worker_b = events.LocalBroker(), events.LocalBroker()
+    user_id = client.get("/api/auth/me", headers=auth).json()["id"]
+
+    async def published_on_a_seen_on_b() -> bool:
+        subscription = worker_b.subscribe(user_id)
+        worker_a.publish(user_id, "ocr.completed", {"jobId": "job", "text": "TOTAL 50.00"})
+        await asyncio.sleep(0)
+        return not subscription.queue.empty()
+
+    # A job on worker A never reaches a stream held by worker B...
+    assert not client.portal.call(published_on_a_seen_on_b)
+    # ...so the ticket says so and the client reads the receipt directly
+    monkeypatch.setattr(events, "get_broker", lambda: worker_b)
+    assert _upload_like_the_frontend(client, auth, worker_b) == "TOTAL 50.00"
+
+
+def test_job_result_arrives_as_an_event_with_a_shared_broker(client, auth, settings, monkeypatch, instant_ocr):
+    monkeypatch.setattr(settings, "API_WORKERS", 2)
+    shared = SharedBroker()
+    monkeypatch.setattr(events, "get_broker", lambda: shared)
+
+    assert _upload_like_the_frontend(client, auth, shared) == "TOTAL 50.00"
+
+
+@pytest.mark.parametrize("workers, shared, cross_worker", [(1, False, True), (2, False, False), (2, True, True)])
+def test_ticket_reports_whether_events_cross_workers(client, auth, settings, monkeypatch, workers, shared, cross_worker):
+    monkeypatch.setattr(settings, "API_WORKERS", workers)
+    broker = SharedBroker() if shared else events.LocalBroker()
+    monkeypatch.setattr(events, "get_broker", lambda: broker)
+
+    assert client.post("/api/events/ticket", headers=auth).json()["crossWorker"] is cross_worker
+
+
+def test_several_workers_without_redis_warn_at_startup(settings, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "EVENTS_REDIS_URL", None)
+    monkeypatch.setattr(settings, "IDEMPOTENCY_REDIS_URL", "redis://localhost")
+
+    main.warn_about_per_worker_state(1)
+    assert not caplog.records
+
+    main.warn_about_per_worker_state(2)
+    assert "EVENTS_REDIS_URL" in caplog.text
+    assert "IDEMPOTENCY_REDIS_URL" not in caplog.text
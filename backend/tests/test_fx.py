@@ -0,0 +1,37 @@
+import pytest
+
+from app.core import fx
+from app.db.session import SessionLocal
+
+
+@pytest.fixture
+def eur_rates(tmp_path):
+    rates = tmp_path / "rates.csv"
+    rates.write_text("date,currency,rate\n2024-02-01,EUR,0.80\n2024-02-29,EUR,0.90\n2024-03-15,EUR,1.00\n2024-01-01,AUD,1.50\n")
+    with SessionLocal() as db:
+        assert fx.import_rates(db, str(rates)) == 4
+
+
+def test_receipts_are_normalized_with_the_latest_earlier_rate(client, auth, receipt, eur_rates):
+    response = client.post("/api/fuel-receipts", json={**receipt, "amountPaid": 45, "advertisedPrice": 1.8, "currency": "EUR"}, headers=auth)
+
+    assert response.status_code == 200
+    assert response.json()["currency"] == "EUR"
+    # 45 EUR at 0.90 per USD, then 1.50 AUD (new users' currency) per USD
+    assert response.json()["amountPaidNormalized"] == 75
+    assert response.json()["advertisedPriceNormalized"] == 3
+
+
+def test_summary_totals_in_the_users_currency(client, auth, receipt, eur_rates):
+    client.post("/api/fuel-receipts", json={**receipt, "amountPaid": 45, "volumePurchased": 20, "currency": "EUR"}, headers=auth)
+    client.post("/api/fuel-receipts", json={**receipt, "odometer": 1500, "amountPaid": 30, "volumePurchased": 10}, headers=auth)
+
+    summary = client.get("/api/fuel-receipts/summary", headers=auth).json()
+
+    assert summary == {"currency": "AUD", "receipts": 2, "totalSpent": 105, "totalVolume": 30}
+
+
+def test_missing_rate_is_rejected(client, auth, receipt, eur_rates):
+    assert client.post("/api/fuel-receipts", json={**receipt, "currency": "GBP"}, headers=auth).status_code == 422
+    assert client.post("/api/fuel-receipts", json={**receipt, "date": "2024-01-15", "currency": "EUR"}, headers=auth).status_code == 422
+    assert client.get("/api/fuel-receipts", headers=auth).json() == []
@@ -0,0 +1,54 @@
+from app import main
+from app.core.idempotency import IDEMPOTENCY_HEADER, REPLAYED_HEADER
+
+
+def test_retry_with_the_same_key_replays_the_first_response(client, auth, receipt):
+    headers = {**auth, IDEMPOTENCY_HEADER: "retry-1"}
+    first = client.post("/api/fuel-receipts", json=receipt, headers=headers)
+    assert first.status_code == 200
+    assert REPLAYED_HEADER not in first.headers
+
+    retry = client.post("/api/fuel-receipts", json=receipt, headers=headers)
+    assert retry.status_code == 200
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json()["id"] == first.json()["id"]
+    assert len(client.get("/api/fuel-receipts", headers=auth).json()) == 1
+
+
+def test_reusing_a_key_for_a_different_body_is_rejected(client, auth, receipt):
+    headers = {**auth, IDEMPOTENCY_HEADER: "retry-2"}
+    assert client.post("/api/fuel-receipts", json=receipt, headers=headers).status_code == 200
+
+    response = client.post("/api/fuel-receipts", json={**receipt, "odometer": 2000}, headers=headers)
+    assert response.status_code == 422
+    assert len(client.get("/api/fuel-receipts", headers=auth).json()) == 1
+
+
+def test_keys_are_scoped_to_the_user(client, register, receipt, auth):
+    assert client.post("/api/fuel-receipts", json=receipt, headers={**auth, IDEMPOTENCY_HEADER: "shared"}).status_code == 200
+
+    other = {"Authorization": f"Bearer {register()['access_token']}"}
+    response = client.post("/api/fuel-receipts", json=receipt, headers={**other, IDEMPOTENCY_HEADER: "shared"})
+    assert REPLAYED_HEADER not in response.headers
+    # Someone else's car: the endpoint runs and refuses it instead of replaying the first user's receipt
+    assert response.status_code == 404
+
+
+def test_duplicate_receipt_without_a_key_is_a_conflict(client, auth, receipt):
+    assert client.post("/api/fuel-receipts", json=receipt, headers=auth).status_code == 200
+
+    duplicate = client.post("/api/fuel-receipts", json=receipt, headers=auth)
+    assert duplicate.status_code == 409
+    assert duplicate.json()["detail"] == "This receipt has already been added."
+
+    # Same fill-up on a different day is a different receipt
+    assert client.post("/api/fuel-receipts", json={**receipt, "date": "2024-03-02"}, headers=auth).status_code == 200
+
+
+def test_several_workers_without_a_shared_store_warn_at_startup(settings, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "EVENTS_REDIS_URL", "redis://localhost")
+    monkeypatch.setattr(settings, "IDEMPOTENCY_REDIS_URL", None)
+
+    main.warn_about_per_worker_state(2)
+    assert "IDEMPOTENCY_REDIS_URL" in caplog.text
+    assert "EVENTS_REDIS_URL" not in caplog.text
@@ -0,0 +1,35 @@
+import time
+import uuid
+
+from app.db.ids import uuid7
+
+
+def test_uuid7_is_version_7_and_time_ordered():
+    before = time.time_ns() // 1_000_000
+    ids = [uuid7() for _ in range(50)]
+    after = time.time_ns() // 1_000_000
+
+    for value in ids:
+        parsed = uuid.UUID(value)
+        assert parsed.version == 7
+        assert parsed.variant == uuid.RFC_4122
+        assert before <= parsed.int >> 80 <= after
+
+    timestamps = [uuid.UUID(value).int >> 80 for value in ids]
+    assert timestamps == sorted(timestamps)
+    assert len(set(ids)) == len(ids)
+
+
+def test_new_rows_get_uuid7_ids(car, client, auth, receipt):
+    assert uuid.UUID(car["id"]).version == 7
+    created = client.post("/api/fuel-receipts", json=receipt, headers=auth).json()
+    assert uuid.UUID(created["id"]).version == 7
+
+
+def test_malformed_ids_are_rejected_before_the_database(client, auth, car):
+    assert client.delete("/api/cars/not-a-uuid", headers=auth).status_code == 422
+    assert client.get("/api/fuel-receipts", params={"car_id": "not-a-uuid"}, headers=auth).status_code == 422
+    assert client.delete("/api/fuel-receipts/not-a-uuid", headers=auth).status_code == 422
+
+    # A well-formed id that isn't there is still a 404
+    assert client.delete(f"/api/cars/{uuid7()}", headers=auth).status_code == 404
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from app.ocr import backends
+
+
+class StubEasyOCR(backends.OCRBackend):
+    """Stands in for EasyOCRBackend so no model weights are loaded."""
+
+    name = "easyocr"
+
+    def __init__(self, quantize: bool = True):
+        self.quantize = quantize
+
+    def readtext(self, image, **kwargs):
+        return [([[0, 0], [1, 0], [1, 1], [0, 1]], "from easyocr", 0.9)]
+
+    def detect(self, image):
+        return "grey", [[0, 1, 0, 1]], []
+
+    def recognize(self, grey, horizontal_boxes, free_boxes):
+        return self.readtext(grey)
+
+
+class FailingReader:
+    """An EasyOCR Reader whose ONNX sessions fail on every call."""
+
+    def readtext(self, image, **kwargs):
+        raise RuntimeError("onnxruntime failed")
+
+    def detect(self, image, **kwargs):
+        raise RuntimeError("onnxruntime failed")
+
+    def recognize(self, grey, horizontal_boxes, free_boxes, **kwargs):
+        raise RuntimeError("onnxruntime failed")
+
+
+@pytest.fixture
+def stub_easyocr(monkeypatch):
+    monkeypatch.setattr(backends, "EasyOCRBackend", StubEasyOCR)
+
+
+def test_missing_onnx_models_fall_back_to_easyocr(stub_easyocr, tmp_path):
+    backend = backends.load_backend("onnx", str(tmp_path))
+    assert isinstance(backend, StubEasyOCR)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        backends.load_backend("tesseract", "models/onnx")
+
+
+@pytest.fixture
+def failing_onnx(stub_easyocr) -> backends.OnnxBackend:
+    # Built without __init__: only the fallbacks are under test
+    backend = object.__new__(backends.OnnxBackend)
+    backend.reader = FailingReader()
+    backend._fallback = None
+    return backend
+
+
+def test_onnx_failure_rereads_the_image_with_easyocr(failing_onnx):
+    assert failing_onnx.readtext("image")[0][1] == "from easyocr"
+    assert isinstance(failing_onnx._fallback, StubEasyOCR)
+
+
+def test_onnx_failure_in_roi_mode_falls_back_per_stage(failing_onnx):
+    grey, horizontal_boxes, free_boxes = failing_onnx.detect(np.zeros((8, 8, 3), np.uint8))
+    assert (grey, horizontal_boxes, free_boxes) == ("grey", [[0, 1, 0, 1]], [])
+
+    assert failing_onnx.recognize(np.zeros((8, 8), np.uint8), horizontal_boxes, free_boxes)[0][1] == "from easyocr"
+
+
+def test_backend_missing_a_method_fails_when_built():
+    class ReadOnly(backends.OCRBackend):
+        def readtext(self, image, **kwargs):
+            return []
+
+    with pytest.raises(TypeError):
+        ReadOnly()
@@ -0,0 +1,52 @@
+import argparse
+import json
+
+import pytest
+
+from benchmarks.fixtures import field_matches, load_doccano_fixtures
+from benchmarks.ocr_eval import _pareto, _regressions
+
+
+def _row(config: str, accuracy: float, ms: float, rss: float) -> dict:
+    return {"config": config, "field_accuracy": accuracy, "ms_per_receipt": ms, "peak_rss_mb": rss}
+
+
+def test_doccano_records_are_grouped_into_fields(tmp_path):
+    (tmp_path / "r1.png").write_bytes(b"png")
+    (tmp_path / "receipts.jsonl").write_text("\n".join(json.dumps(record) for record in [
+        {"id": "r1", "words": ["TOTAL", "$", "50.00", "30.00", "L"], "labels": ["O", "B-TOTAL", "I-TOTAL", "LITRES", "LITRES"]},
+        {"id": "r2", "words": ["THANK", "YOU"], "labels": ["O", "O"]},
+    ]))
+
+    fixtures = list(load_doccano_fixtures(str(tmp_path / "receipts.jsonl")))
+    assert fixtures == [("r1", b"png", {"total": "$ 50.00", "litres": "30.00 L"})]
+
+
+def test_missing_fixture_image_is_reported(tmp_path):
+    (tmp_path / "receipts.jsonl").write_text(json.dumps({"id": "r1", "words": ["50.00"], "labels": ["TOTAL"]}))
+    with pytest.raises(FileNotFoundError, match="r1"):
+        list(load_doccano_fixtures(str(tmp_path / "receipts.jsonl")))
+
+
+def test_fields_must_appear_within_one_line():
+    text = "TOTAL  $ 50.00\n30.00\nL"
+    assert field_matches(text, {"total": "$ 50.00", "litres": "30.00 L"}) == {"total": True, "litres": False}
+
+
+def test_pareto_front_drops_dominated_configurations():
+    rows = [
+        _row("accurate", 0.95, 300, 900),
+        _row("fast", 0.80, 100, 500),
+        _row("worse", 0.80, 150, 600),
+    ]
+    assert _pareto(rows) == {"accurate", "fast"}
+
+
+def test_regressions_against_the_baseline():
+    args = argparse.Namespace(max_accuracy_drop=0.01, max_slowdown=0.25, max_rss_growth=0.10)
+    baseline = {"easyocr": _row("easyocr", 0.90, 100, 500), "onnx": _row("onnx", 0.90, 100, 500)}
+    rows = [_row("easyocr", 0.895, 120, 540), _row("onnx", 0.85, 130, 600), _row("new", 0.1, 999, 999)]
+
+    failures = _regressions(rows, baseline, args)
+    assert len(failures) == 3
+    assert all(failure.startswith("onnx:") for failure in failures)
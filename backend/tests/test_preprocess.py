@@ -0,0 +1,67 @@
+import cv2
+import numpy as np
+import pytest
+
+from app.ocr import preprocess
+
+
+def _text_lines(width: int = 600, height: int = 400, char_height: int = 16) -> np.ndarray:
+    """White page with rows of dark character-sized blocks."""
+    image = np.full((height, width, 3), 255, np.uint8)
+    for top in range(40, height - 40, char_height * 3):
+        for left in range(40, width - 60, char_height):
+            cv2.rectangle(image, (left, top), (left + char_height // 2 - 1, top + char_height - 1), (0, 0, 0), -1)
+    return image
+
+
+def _row_profile_spread(image: np.ndarray) -> float:
+    # Horizontal lines give sharply alternating row sums; skewed ones smear them out
+    return float(np.std((preprocess._grey(image) < 128).sum(axis=1)))
+
+
+def test_stages_run_in_pipeline_order():
+    assert preprocess.parse_stages("binarize, crop,deskew") == ["crop", "deskew", "binarize"]
+    assert preprocess.parse_stages("") == []
+
+
+def test_unknown_stage_is_rejected():
+    with pytest.raises(ValueError, match="sharpen"):
+        preprocess.parse_stages("crop,sharpen")
+
+
+def test_crop_flattens_the_receipt_off_the_background():
+    image = np.full((600, 800, 3), 40, np.uint8)
+    corners = np.array([[220, 80], [560, 100], [540, 540], [200, 520]], np.int32)
+    cv2.fillConvexPoly(image, corners, (255, 255, 255))
+
+    cropped = preprocess.crop_document(image)
+    height, width = cropped.shape[:2]
+    assert 320 < width < 380 and 420 < height < 480
+    assert cropped.mean() > 200
+
+
+def test_resize_scales_to_the_target_text_height():
+    resized = preprocess.resize_to_text_height(_text_lines(char_height=16), target_text_height=32)
+    assert resized.shape[:2] == (800, 1200)
+
+
+def test_deskew_straightens_text_lines():
+    image = _text_lines()
+    rotation = cv2.getRotationMatrix2D((300, 200), 6, 1.0)
+    skewed = cv2.warpAffine(image, rotation, (600, 400), borderValue=(255, 255, 255))
+
+    assert _row_profile_spread(preprocess.deskew(skewed)) > 1.5 * _row_profile_spread(skewed)
+
+
+def test_run_decodes_and_times_each_stage():
+    _, encoded = cv2.imencode(".png", _text_lines())
+    image, timings = preprocess.run(encoded.tobytes(), ["deskew", "binarize"])
+
+    assert image.ndim == 2
+    assert set(np.unique(image)) <= {0, 255}
+    assert set(timings) == {"decode", "deskew", "binarize"}
+
+
+def test_undecodable_image_is_rejected():
+    with pytest.raises(ValueError):
+        preprocess.run(b"not an image", ["binarize"])
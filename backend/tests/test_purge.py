@@ -0,0 +1,86 @@
+import time
+
+import pytest
+from sqlalchemy import event
+
+from app.core import purge
+from app.db.session import SessionLocal
+from app.models.car_purge import CarPurge
+
+
+def _wait_for_purge(client, auth, car_id) -> dict:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        state = client.get(f"/api/cars/{car_id}/purge", headers=auth).json()
+        if state["completedAt"]:
+            return state
+        time.sleep(0.02)
+    raise AssertionError("purge did not complete")
+
+
+def _new_car(client, auth) -> dict:
+    response = client.post("/api/cars", json={"name": "Spare", "make": "Kia", "model": "Rio", "year": 2019, "fuelType": "petrol", "isDefault": False}, headers=auth)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_deleted_car_is_purged_in_the_background(client, auth, car, receipt, settings, monkeypatch):
+    monkeypatch.setattr(settings, "PURGE_BATCH_SIZE", 2)
+    for odometer in range(5):
+        assert client.post("/api/fuel-receipts", json={**receipt, "odometer": odometer}, headers=auth).status_code == 200
+
+    assert client.delete(f"/api/cars/{car['id']}", headers=auth).status_code == 204
+    assert client.get("/api/fuel-receipts", headers=auth).json() == []
+
+    state = _wait_for_purge(client, auth, car["id"])
+    assert state["purgedReceipts"] == 5
+    assert state["remainingReceipts"] == 0
+    assert client.get("/api/cars", headers=auth).json() == []
+
+
+def test_receipts_need_a_live_car_of_the_users_own(client, register, auth, car, receipt):
+    other_user = {"Authorization": f"Bearer {register()['access_token']}"}
+    assert client.post("/api/fuel-receipts", json=receipt, headers=other_user).status_code == 404
+
+    saved = client.post("/api/fuel-receipts", json=receipt, headers=auth).json()
+    other_car = _new_car(client, other_user)
+    assert client.put(f"/api/fuel-receipts/{saved['id']}", json={"carId": other_car["id"]}, headers=auth).status_code == 404
+
+    spare = _new_car(client, auth)
+    client.delete(f"/api/cars/{spare['id']}", headers=auth)
+    assert client.post("/api/fuel-receipts", json={**receipt, "carId": spare["id"]}, headers=auth).status_code == 404
+    assert client.put(f"/api/fuel-receipts/{saved['id']}", json={"carId": spare["id"]}, headers=auth).status_code == 404
+
+
+@pytest.fixture
+def no_purge_worker(monkeypatch):
+    """Leaves purging to the test, which calls purge_next_batch itself."""
+    async def idle():
+        pass
+
+    monkeypatch.setattr(purge, "run_worker", idle)
+
+
+def test_failing_purge_backs_off_without_blocking_later_ones(no_purge_worker, client, auth, database):
+    failing, later = _new_car(client, auth), _new_car(client, auth)
+    client.delete(f"/api/cars/{failing['id']}", headers=auth)
+    client.delete(f"/api/cars/{later['id']}", headers=auth)
+
+    def fail_first_car(connection, cursor, statement, parameters, context, executemany):
+        # SQLite gets the uuid as bare hex, Postgres in its usual form
+        if statement.startswith("DELETE FROM cars") and {failing["id"], failing["id"].replace("-", "")} & {str(value) for value in (parameters.values() if isinstance(parameters, dict) else parameters)}:
+            raise RuntimeError("lock timeout")
+
+    event.listen(database, "before_cursor_execute", fail_first_car)
+    try:
+        with pytest.raises(RuntimeError):
+            purge.purge_next_batch(10)
+        assert purge.purge_next_batch(10)
+        assert not purge.purge_next_batch(10)
+    finally:
+        event.remove(database, "before_cursor_execute", fail_first_car)
+
+    with SessionLocal() as db:
+        failed = db.get(CarPurge, failing["id"])
+        assert (failed.attempts, failed.completed_at) == (1, None)
+        assert db.get(CarPurge, later["id"]).completed_at is not None
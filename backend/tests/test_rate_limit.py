@@ -0,0 +1,50 @@
+import pytest
+
+
+@pytest.fixture
+def limited(settings, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_AUTH_PER_MINUTE", 2)
+    monkeypatch.setattr(settings, "RATE_LIMIT_CRUD_PER_MINUTE", 3)
+    return settings
+
+
+def _login(client):
+    return client.post("/api/auth/login", json={"email": "nobody@example.com", "password": "wrong-password"})
+
+
+def test_auth_bucket_answers_429_with_retry_after(client, limited):
+    assert [_login(client).status_code for _ in range(2)] == [401, 401]
+
+    response = _login(client)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_users_have_their_own_crud_bucket(client, register, limited):
+    first, second = ({"Authorization": f"Bearer {register()['access_token']}"} for _ in range(2))
+
+    assert [client.get("/api/cars", headers=first).status_code for _ in range(4)] == [200, 200, 200, 429]
+    assert client.get("/api/cars", headers=second).status_code == 200
+
+
+def test_health_is_exempt(client, limited):
+    assert all(client.get("/api/health").status_code == 200 for _ in range(5))
+
+
+def test_counters_are_hidden_without_a_metrics_token(client, settings, monkeypatch):
+    assert client.get("/api/health/rate-limits").status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "metrics-secret")
+    assert client.get("/api/health/rate-limits").status_code == 401
+    assert client.get("/api/health/rate-limits", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+
+def test_counters_with_the_metrics_token(client, limited, monkeypatch):
+    monkeypatch.setattr(limited, "METRICS_TOKEN", "metrics-secret")
+    for _ in range(3):
+        _login(client)
+
+    response = client.get("/api/health/rate-limits", headers={"Authorization": "Bearer metrics-secret"})
+    assert response.status_code == 200
+    assert response.json()["counters"]["auth"] == {"allowed": 2, "limited": 1}
@@ -0,0 +1,53 @@
+from app.ocr import roi
+
+
+class FakeBackend:
+    """Detects fixed boxes and 'recognizes' them from a lookup, counting recognizer calls."""
+
+    def __init__(self, horizontal: dict, free: dict):
+        self.horizontal = horizontal
+        self.free = free
+        self.calls = []
+
+    def detect(self, image):
+        return "grey", [list(box) for box in self.horizontal], [[list(point) for point in box] for box in self.free]
+
+    def recognize(self, grey, horizontal_boxes, free_boxes):
+        self.calls.append(len(horizontal_boxes) + len(free_boxes))
+        results = [([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], self.horizontal[(x0, x1, y0, y1)], 0.9) for x0, x1, y0, y1 in horizontal_boxes]
+        results += [(box, self.free[tuple(tuple(point) for point in box)], 0.9) for box in free_boxes]
+        # Like EasyOCR: ordered by position, not by the order boxes were passed in
+        return sorted(results, key=lambda result: (result[0][0][1], -result[0][0][0]))
+
+
+def _backend():
+    return FakeBackend(
+        horizontal={
+            (0, 40, 10, 20): "TOTAL", (60, 100, 10, 20): "50.00",
+            (0, 50, 40, 50): "THANK",
+            (0, 40, 70, 80): "LITRES",
+            (0, 40, 100, 110): "30.00", (60, 100, 100, 110): "L",
+        },
+        free={((60, 40), (100, 40), (100, 50), (60, 50)): "YOU"},
+    )
+
+
+def test_readtext_recognizes_in_two_calls():
+    backend = _backend()
+
+    results, stats = roi.readtext(backend, image=None)
+
+    assert backend.calls == [4, 2]
+    assert [text for _, text, _ in results] == ["TOTAL", "50.00", "LITRES", "30.00", "L"]
+    assert stats["recognized"] == 6
+    assert stats["fields"] == ["litres", "total"]
+
+
+def test_readtext_falls_back_to_every_line():
+    backend = FakeBackend(horizontal={(0, 40, 10, 20): "THANK", (60, 100, 10, 20): "YOU", (0, 40, 40, 50): "BYE"}, free={})
+
+    results, stats = roi.readtext(backend, image=None)
+
+    assert backend.calls == [2, 1]
+    assert sorted(text for _, text, _ in results) == ["BYE", "THANK", "YOU"]
+    assert stats["fields"] == []
@@ -0,0 +1,50 @@
+from app.db import routing
+
+
+def _reads_primary(client, headers) -> bool:
+    captured = {}
+    original = routing.use_replica
+
+    def spy(request):
+        captured["replica"] = original(request)
+        return captured["replica"]
+
+    routing.use_replica = spy
+    try:
+        client.get("/api/cars", headers=headers)
+    finally:
+        routing.use_replica = original
+    return not captured["replica"]
+
+
+def test_committed_write_returns_signed_primary_until(client, auth, car):
+    response = client.post("/api/cars", json={"name": "Second", "make": "Kia", "model": "Rio", "year": 2019, "fuelType": "petrol", "isDefault": False}, headers=auth)
+
+    primary_until = response.headers[routing.PRIMARY_UNTIL_HEADER]
+    assert _reads_primary(client, {**auth, routing.PRIMARY_UNTIL_HEADER: primary_until})
+    assert not _reads_primary(client, auth)
+
+
+def test_requests_without_writes_get_no_header(client, register):
+    user = register()
+    response = client.post("/api/auth/login", json={"email": user["user"]["email"], "password": "password123"})
+
+    assert response.status_code == 200
+    assert routing.PRIMARY_UNTIL_HEADER not in response.headers
+
+
+def test_registration_binds_the_header_to_the_new_user(client):
+    response = client.post("/api/auth/register", json={"email": "new@example.com", "firstName": "A", "lastName": "B", "password": "password123"})
+
+    auth = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert _reads_primary(client, {**auth, routing.PRIMARY_UNTIL_HEADER: response.headers[routing.PRIMARY_UNTIL_HEADER]})
+
+
+def test_forged_or_foreign_header_is_ignored(client, register, auth, car):
+    response = client.post("/api/cars", json={"name": "Second", "make": "Kia", "model": "Rio", "year": 2019, "fuelType": "petrol", "isDefault": False}, headers=auth)
+    primary_until = response.headers[routing.PRIMARY_UNTIL_HEADER]
+    other_user = {"Authorization": f"Bearer {register()['access_token']}"}
+
+    assert not _reads_primary(client, {**other_user, routing.PRIMARY_UNTIL_HEADER: primary_until})
+    assert not _reads_primary(client, {**auth, routing.PRIMARY_UNTIL_HEADER: "99999999999.forged"})
+    assert not _reads_primary(client, {**auth, routing.PRIMARY_UNTIL_HEADER: "99999999999"})
@@ -0,0 +1,42 @@
+import os
+import socket
+import time
+
+import pytest
+
+from app.core import lifecycle
+from app.core.server import Supervisor, WorkerPool
+
+
+@pytest.fixture
+def draining():
+    yield
+    lifecycle._draining.value = 0
+
+
+def test_readiness_fails_while_draining(client, draining):
+    assert client.get("/api/health/ready").status_code == 200
+
+    lifecycle.mark_draining()
+    response = client.get("/api/health/ready")
+    assert response.status_code == 503
+    assert response.json()["tiers"]["api"] == "draining"
+
+
+def test_shutdown_drains_then_stops_workers(draining):
+    pool = WorkerPool("api", app=None, host="127.0.0.1", port=0, workers=1)
+    pool.sock = socket.socket()
+    pid = os.fork()
+    if pid == 0:
+        # Stands in for a uvicorn worker: exits on the default SIGTERM action
+        time.sleep(30)
+        os._exit(0)
+    pool.pids.add(pid)
+
+    started = time.monotonic()
+    Supervisor([pool], drain_seconds=0.2, graceful_timeout=5)._shutdown()
+
+    assert lifecycle.is_draining()
+    assert pool.pids == set()
+    assert pool.sock.fileno() == -1
+    assert time.monotonic() - started < 5
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+from app.db import session
+from app.main import create_app
+
+
+def test_importing_the_app_defers_settings_and_heavy_libraries():
+    # A fresh interpreter without the test environment: importing must not need settings
+    environment = {key: value for key, value in os.environ.items() if key not in ("SECRET_KEY", "PRIMARY_DATABASE_URL")}
+    script = (
+        "import sys, app.main\n"
+        "from app.core import config\n"
+        "assert config.get_settings.cache_info().currsize == 0\n"
+        "print(','.join(sorted(m for m in ('jose', 'passlib', 'easyocr', 'torch', 'cv2', 'redis') if m in sys.modules)))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=environment, cwd=os.path.dirname(os.path.dirname(__file__)))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_create_app_does_not_build_engines():
+    session.get_engine.cache_clear()
+    session.get_replica_engine.cache_clear()
+    create_app()
+    assert session.get_engine.cache_info().currsize == 0
+    assert session.get_replica_engine.cache_info().currsize == 0
@@ -33,7 +33,10 @@ export default function UploadPage() {
         setShowForm(true)
         toast({
           title: "Receipt processed successfully",
-          description: `OCR completed with ${Math.round((data.ocrResult.confidence || 0) * 100)}% confidence`,
+          description:
+            data.ocrResult.confidence !== undefined
+              ? `OCR completed with ${Math.round(data.ocrResult.confidence * 100)}% confidence`
+              : "Review the extracted text below",
         })
       } else {
         toast({
@@ -216,7 +219,8 @@ export default function UploadPage() {
               <Alert>
                 <CheckCircle className="h-4 w-4" />
                 <AlertDescription>
-                  OCR processing completed with {Math.round((ocrResult.confidence || 0) * 100)}% confidence.
+                  OCR processing completed
+                  {ocrResult.confidence !== undefined && ` with ${Math.round(ocrResult.confidence * 100)}% confidence`}.
                   {ocrResult.processingTime && ` Processing time: ${ocrResult.processingTime}ms`}
                 </AlertDescription>
               </Alert>
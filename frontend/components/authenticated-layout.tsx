@@ -4,12 +4,15 @@ import type React from "react"
 import { SidebarProvider } from "@/components/ui/sidebar"
 import { AppSidebar } from "@/components/app-sidebar"
 import { AuthGuard } from "@/components/auth-guard"
+import { useServerEvents } from "@/hooks/use-server-events"
 
 interface AuthenticatedLayoutProps {
   children: React.ReactNode
 }
 
 export function AuthenticatedLayout({ children }: AuthenticatedLayoutProps) {
+  useServerEvents()
+
   return (
     <AuthGuard requireAuth={true}>
       <SidebarProvider defaultOpen={true}>
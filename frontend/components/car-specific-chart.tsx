@@ -2,6 +2,8 @@
 
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card"
 import { ChartContainer, ChartTooltip, ChartTooltipContent } from "@/components/ui/chart"
+import { useAuth } from "@/contexts/auth-context"
+import { formatCurrency, spentInUserCurrency } from "@/lib/currencies"
 import type { FuelReceipt, Car } from "@/lib/types"
 import { LineChart, Line, XAxis, YAxis, ResponsiveContainer, BarChart, Bar, PieChart, Pie, Cell } from "recharts"
 
@@ -14,6 +16,10 @@ interface CarSpecificChartProps {
 const COLORS = ["#0088FE", "#00C49F", "#FFBB28", "#FF8042", "#8884D8", "#82CA9D"]
 
 export function CarSpecificChart({ receipts, cars, selectedCarId }: CarSpecificChartProps) {
+  // Amounts are charted in the user's currency, which receipts in other currencies are converted to
+  const { user } = useAuth()
+  const currency = user?.currency ?? "USD"
+
   // Filter receipts by selected car or show all
   const filteredReceipts = selectedCarId ? receipts.filter((receipt) => receipt.carId === selectedCarId) : receipts
 
@@ -22,7 +28,7 @@ export function CarSpecificChart({ receipts, cars, selectedCarId }: CarSpecificC
     .sort((a, b) => new Date(a.date).getTime() - new Date(b.date).getTime())
     .map((receipt) => ({
       date: new Date(receipt.date).toLocaleDateString("en-US", { month: "short", day: "numeric" }),
-      amount: receipt.amount,
+      amount: spentInUserCurrency(receipt),
       odometer: receipt.odometer,
       car: cars.find((c) => c.carId === receipt.carId)?.name || "Unknown",
     }))
@@ -31,7 +37,7 @@ export function CarSpecificChart({ receipts, cars, selectedCarId }: CarSpecificC
   const monthlyData = filteredReceipts.reduce(
     (acc, receipt) => {
       const month = new Date(receipt.date).toLocaleDateString("en-US", { year: "numeric", month: "short" })
-      acc[month] = (acc[month] || 0) + receipt.amount
+      acc[month] = (acc[month] || 0) + spentInUserCurrency(receipt)
       return acc
     },
     {} as Record<string, number>,
@@ -47,7 +53,7 @@ export function CarSpecificChart({ receipts, cars, selectedCarId }: CarSpecificC
     ? cars
         .map((car) => {
           const carReceipts = receipts.filter((r) => r.carId === car.id)
-          const total = carReceipts.reduce((sum, r) => sum + r.amount, 0)
+          const total = carReceipts.reduce((sum, r) => sum + spentInUserCurrency(r), 0)
           return {
             name: car.name,
             value: total,
@@ -60,7 +66,7 @@ export function CarSpecificChart({ receipts, cars, selectedCarId }: CarSpecificC
 
   const chartConfig = {
     amount: {
-      label: "Amount ($)",
+      label: `Amount (${currency})`,
       color: "hsl(var(--chart-1))",
     },
     odometer: {
@@ -133,7 +139,7 @@ export function CarSpecificChart({ receipts, cars, selectedCarId }: CarSpecificC
                   cx="50%"
                   cy="50%"
                   labelLine={false}
-                  label={({ name, value, percent }) => `${name}: $${value.toFixed(0)} (${(percent * 100).toFixed(0)}%)`}
+                  label={({ name, value, percent }) => `${name}: ${formatCurrency(value, currency)} (${(percent * 100).toFixed(0)}%)`}
                   outerRadius={80}
                   fill="#8884d8"
                   dataKey="value"
@@ -149,7 +155,7 @@ export function CarSpecificChart({ receipts, cars, selectedCarId }: CarSpecificC
                       return (
                         <div className="bg-background border rounded-lg p-2 shadow-md">
                           <p className="font-medium">{data.name}</p>
-                          <p className="text-sm">Total: ${data.value.toFixed(2)}</p>
+                          <p className="text-sm">Total: {formatCurrency(data.value, currency)}</p>
                           <p className="text-sm">{data.receipts} receipts</p>
                         </div>
                       )
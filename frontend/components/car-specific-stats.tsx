@@ -1,7 +1,10 @@
 "use client"
 
+import { useQuery } from "@tanstack/react-query"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
+import { api } from "@/lib/api"
+import { formatCurrency, spentInUserCurrency } from "@/lib/currencies"
 import type { FuelReceipt, Car } from "@/lib/types"
 import { DollarSign, TrendingUp, Gauge, Calendar, Fuel, BarChart3 } from "lucide-react"
 
@@ -17,9 +20,14 @@ export function CarSpecificStats({ receipts, cars, selectedCarId }: CarSpecificS
 
   const selectedCar = selectedCarId ? cars.find((car) => car.id === selectedCarId) : null
 
-  // Calculate stats
-  const totalSpent = filteredReceipts.reduce((sum, receipt) => sum + receipt.amount, 0)
-  const averagePerFillup = filteredReceipts.length > 0 ? totalSpent / filteredReceipts.length : 0
+  // Totals come from the server, converted into the user's currency
+  const { data: summary } = useQuery({
+    queryKey: ["fuel-receipts", "summary", selectedCarId],
+    queryFn: () => api.getFuelReceiptSummary(selectedCarId ?? undefined),
+  })
+  const currency = summary?.currency ?? "USD"
+  const totalSpent = summary?.totalSpent ?? 0
+  const averagePerFillup = summary && summary.receipts > 0 ? totalSpent / summary.receipts : 0
 
   // Calculate distance and fuel efficiency
   const sortedReceipts = [...filteredReceipts].sort((a, b) => new Date(a.date).getTime() - new Date(b.date).getTime())
@@ -27,8 +35,7 @@ export function CarSpecificStats({ receipts, cars, selectedCarId }: CarSpecificS
   const firstOdometer = sortedReceipts.length > 0 ? sortedReceipts[0].odometer : 0
   const totalDistance = lastOdometer - firstOdometer
 
-  // Calculate fuel efficiency (assuming amount represents liters for simplicity)
-  const totalFuel = filteredReceipts.reduce((sum, receipt) => sum + receipt.amount / 1.5, 0) // Rough conversion
+  const totalFuel = summary?.totalVolume ?? 0
   const fuelEfficiency = totalDistance > 0 && totalFuel > 0 ? totalDistance / totalFuel : 0
 
   // This month spending
@@ -39,14 +46,14 @@ export function CarSpecificStats({ receipts, cars, selectedCarId }: CarSpecificS
       const date = new Date(r.date)
       return date.getMonth() === thisMonth && date.getFullYear() === thisYear
     })
-    .reduce((sum, receipt) => sum + receipt.amount, 0)
+    .reduce((sum, receipt) => sum + spentInUserCurrency(receipt), 0)
 
   // Per-car breakdown if showing all cars
   const carBreakdown = !selectedCarId
     ? cars
         .map((car) => {
           const carReceipts = receipts.filter((r) => r.carId === car.id)
-          const carTotal = carReceipts.reduce((sum, r) => sum + r.amount, 0)
+          const carTotal = carReceipts.reduce((sum, r) => sum + spentInUserCurrency(r), 0)
           return {
             car,
             receipts: carReceipts.length,
@@ -90,9 +97,9 @@ export function CarSpecificStats({ receipts, cars, selectedCarId }: CarSpecificS
             <DollarSign className="h-4 w-4 text-muted-foreground" />
           </CardHeader>
           <CardContent>
-            <div className="text-2xl font-bold">${totalSpent.toFixed(2)}</div>
+            <div className="text-2xl font-bold">{formatCurrency(totalSpent, currency)}</div>
             <p className="text-xs text-muted-foreground">
-              Across {filteredReceipts.length} fill-ups
+              Across {summary?.receipts ?? 0} fill-ups
               {selectedCarId ? ` for ${selectedCar?.name}` : " for all cars"}
             </p>
           </CardContent>
@@ -104,7 +111,7 @@ export function CarSpecificStats({ receipts, cars, selectedCarId }: CarSpecificS
             <Calendar className="h-4 w-4 text-muted-foreground" />
           </CardHeader>
           <CardContent>
-            <div className="text-2xl font-bold">${thisMonthSpent.toFixed(2)}</div>
+            <div className="text-2xl font-bold">{formatCurrency(thisMonthSpent, currency)}</div>
             <p className="text-xs text-muted-foreground">Current month spending</p>
           </CardContent>
         </Card>
@@ -115,7 +122,7 @@ export function CarSpecificStats({ receipts, cars, selectedCarId }: CarSpecificS
             <TrendingUp className="h-4 w-4 text-muted-foreground" />
           </CardHeader>
           <CardContent>
-            <div className="text-2xl font-bold">${averagePerFillup.toFixed(2)}</div>
+            <div className="text-2xl font-bold">{formatCurrency(averagePerFillup, currency)}</div>
             <p className="text-xs text-muted-foreground">Average cost per visit</p>
           </CardContent>
         </Card>
@@ -172,7 +179,7 @@ export function CarSpecificStats({ receipts, cars, selectedCarId }: CarSpecificS
                     <Badge className={`text-xs ${getFuelTypeColor(car.fuelType)}`}>{car.fuelType}</Badge>
                   </div>
                   <div className="text-right">
-                    <p className="font-semibold">${total.toFixed(2)}</p>
+                    <p className="font-semibold">{formatCurrency(total, currency)}</p>
                     <p className="text-sm text-muted-foreground">
                       {carReceipts} receipts • {percentage.toFixed(1)}%
                     </p>
@@ -3,8 +3,10 @@
 import { useQuery } from "@tanstack/react-query"
 import { Wifi, WifiOff, Loader2 } from "lucide-react"
 import { api } from "@/lib/api"
+import { useServerEventsConnected } from "@/hooks/use-server-events"
 
 export function ConnectionStatus() {
+  const eventsConnected = useServerEventsConnected()
   const {
     data: healthStatus,
     isLoading,
@@ -12,11 +14,13 @@ export function ConnectionStatus() {
   } = useQuery({
     queryKey: ["health-check"],
     queryFn: api.healthCheck,
-    refetchInterval: 30000, // Check every 30 seconds
+    // The open event stream already proves the backend is up; only poll without it
+    refetchInterval: eventsConnected ? false : 30000,
+    enabled: !eventsConnected,
     retry: false,
   })
 
-  if (isLoading) {
+  if (isLoading && !eventsConnected) {
     return (
       <div className="flex items-center gap-2 text-sm text-muted-foreground">
         <Loader2 className="h-4 w-4 animate-spin" />
@@ -25,7 +29,7 @@ export function ConnectionStatus() {
     )
   }
 
-  if (isError) {
+  if (isError && !eventsConnected) {
     return (
       <div className="flex items-center gap-2 text-sm text-destructive">
         <WifiOff className="h-4 w-4" />
@@ -2,6 +2,8 @@
 
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card"
 import { ChartContainer, ChartTooltip, ChartTooltipContent } from "@/components/ui/chart"
+import { useAuth } from "@/contexts/auth-context"
+import { spentInUserCurrency } from "@/lib/currencies"
 import type { FuelReceipt } from "@/lib/types"
 import { LineChart, Line, XAxis, YAxis, ResponsiveContainer, BarChart, Bar } from "recharts"
 
@@ -10,12 +12,16 @@ interface FuelChartProps {
 }
 
 export function FuelChart({ receipts }: FuelChartProps) {
+  // Amounts are charted in the user's currency, which receipts in other currencies are converted to
+  const { user } = useAuth()
+  const currency = user?.currency ?? "USD"
+
   // Prepare data for charts
   const chartData = receipts
     .sort((a, b) => new Date(a.date).getTime() - new Date(b.date).getTime())
     .map((receipt) => ({
       date: new Date(receipt.date).toLocaleDateString("en-US", { month: "short", day: "numeric" }),
-      amount: receipt.amount,
+      amount: spentInUserCurrency(receipt),
       odometer: receipt.odometer,
     }))
 
@@ -23,7 +29,7 @@ export function FuelChart({ receipts }: FuelChartProps) {
   const monthlyData = receipts.reduce(
     (acc, receipt) => {
       const month = new Date(receipt.date).toLocaleDateString("en-US", { year: "numeric", month: "short" })
-      acc[month] = (acc[month] || 0) + receipt.amount
+      acc[month] = (acc[month] || 0) + spentInUserCurrency(receipt)
       return acc
     },
     {} as Record<string, number>,
@@ -36,7 +42,7 @@ export function FuelChart({ receipts }: FuelChartProps) {
 
   const chartConfig = {
     amount: {
-      label: "Amount ($)",
+      label: `Amount (${currency})`,
       color: "hsl(var(--chart-1))",
     },
     odometer: {
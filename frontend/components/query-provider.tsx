@@ -6,7 +6,12 @@ import { QueryClient, QueryClientProvider } from "@tanstack/react-query"
 import { useState } from "react"
 
 export function QueryProvider({ children }: { children: React.ReactNode }) {
-  const [queryClient] = useState(() => new QueryClient())
+  const [queryClient] = useState(
+    () =>
+      // Refetches stale data like React Query normally does; useServerEvents relaxes
+      // this while the event stream delivers every change
+      new QueryClient(),
+  )
 
   return <QueryClientProvider client={queryClient}>{children}</QueryClientProvider>
 }
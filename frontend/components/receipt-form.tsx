@@ -2,7 +2,7 @@
 
 import type React from "react"
 
-import { useState, useEffect } from "react"
+import { useState, useEffect, useRef } from "react"
 import { useMutation, useQuery } from "@tanstack/react-query"
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card"
 import { Button } from "@/components/ui/button"
@@ -14,6 +14,8 @@ import { api } from "@/lib/api"
 import type { FuelReceipt, OCRResult } from "@/lib/types"
 import { useToast } from "@/hooks/use-toast"
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select"
+import { useAuth } from "@/contexts/auth-context"
+import { CURRENCIES } from "@/lib/currencies"
 
 interface ReceiptFormProps {
   initialData?: OCRResult | FuelReceipt | null
@@ -34,6 +36,9 @@ export function ReceiptForm({ initialData, onSuccess, onCancel, imagePreview }:
   })
 
   const [selectedCarId, setSelectedCarId] = useState<string>(isUpdating ? initialData.carId : "")
+  // The currency the receipt was paid in; totals convert it to the user's currency
+  const { user } = useAuth()
+  const [currency, setCurrency] = useState<string>((isUpdating && initialData.currency) || user?.currency || "USD")
   const [ minimumOdometer, setMinimumOdometer] = useState<number>(0);
   const [ maximumOdometer, setMaximumOdometer] = useState<number | false>(false);
 
@@ -115,8 +120,15 @@ export function ReceiptForm({ initialData, onSuccess, onCancel, imagePreview }:
 
   const { toast } = useToast()
 
+  // One key per version of the form's contents, so a double tap or retry replays the first save
+  const idempotencyKey = useRef(crypto.randomUUID())
+  useEffect(() => {
+    idempotencyKey.current = crypto.randomUUID()
+  }, [formData, selectedCarId, currency])
+
   const saveMutation = useMutation({
-    mutationFn: api.saveFuelReceipt,
+    mutationFn: (receipt: Omit<FuelReceipt, "id" | "createdAt" | "updatedAt" | "userId">) =>
+      api.saveFuelReceipt(receipt, idempotencyKey.current),
     onSuccess: () => {
       onSuccess()
     },
@@ -229,6 +241,9 @@ export function ReceiptForm({ initialData, onSuccess, onCancel, imagePreview }:
       if (!initialData || initialData.carId === undefined || selectedCarId !== initialData.carId) {
         updates.carId = selectedCarId;
       }
+      if (!initialData || initialData.currency === undefined || currency !== initialData.currency) {
+        updates.currency = currency;
+      }
 
       if (Object.keys(updates).length === 0) {
         toast({
@@ -251,6 +266,7 @@ export function ReceiptForm({ initialData, onSuccess, onCancel, imagePreview }:
         // vendor: formData.vendor.trim(),
         odometer,
         carId: selectedCarId,
+        currency,
       })
     }
   }
@@ -293,7 +309,9 @@ export function ReceiptForm({ initialData, onSuccess, onCancel, imagePreview }:
             {initialData
               ? isUpdating
                 ? "Edit your fuel receipt details"
-                : `Review and adjust the extracted information (Confidence: ${Math.round((initialData.confidence || 0) * 100)}%)`
+                : "confidence" in initialData && initialData.confidence !== undefined
+                  ? `Review and adjust the extracted information (Confidence: ${Math.round(initialData.confidence * 100)}%)`
+                  : "Review and adjust the extracted information"
               : "Enter your fuel receipt details manually"}
           </CardDescription>
         </CardHeader>
@@ -331,7 +349,23 @@ export function ReceiptForm({ initialData, onSuccess, onCancel, imagePreview }:
               </div>
 
               <div className="space-y-2">
-                <Label htmlFor="amountPaid">Amount Paid ($) *</Label>
+                <Label htmlFor="currency">Currency *</Label>
+                <Select value={currency} onValueChange={setCurrency} required>
+                  <SelectTrigger id="currency">
+                    <SelectValue placeholder="Select a currency" />
+                  </SelectTrigger>
+                  <SelectContent>
+                    {CURRENCIES.map((option) => (
+                      <SelectItem key={option.value} value={option.value}>
+                        {option.label}
+                      </SelectItem>
+                    ))}
+                  </SelectContent>
+                </Select>
+              </div>
+
+              <div className="space-y-2">
+                <Label htmlFor="amountPaid">Amount Paid ({currency}) *</Label>
                 <Input
                   id="amountPaid"
                   type="number"
@@ -361,7 +395,7 @@ export function ReceiptForm({ initialData, onSuccess, onCancel, imagePreview }:
               </div>
 
               <div className="space-y-2">
-                <Label htmlFor="advertisedPrice">Advertised Price ($/L) *</Label>
+                <Label htmlFor="advertisedPrice">Advertised Price ({currency}/L) *</Label>
                 <Input
                   id="advertisedPrice"
                   type="number"
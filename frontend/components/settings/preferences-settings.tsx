@@ -12,20 +12,12 @@ import { Loader2, Save, Settings } from "lucide-react"
 import { api } from "@/lib/api"
 import type { User, UpdateUserRequest } from "@/lib/types"
 import { useToast } from "@/hooks/use-toast"
+import { CURRENCIES } from "@/lib/currencies"
 
 interface PreferencesSettingsProps {
   user: User | null
 }
 
-const currencies = [
-  { value: "USD", label: "US Dollar ($)" },
-  { value: "EUR", label: "Euro (€)" },
-  { value: "GBP", label: "British Pound (£)" },
-  { value: "CAD", label: "Canadian Dollar (C$)" },
-  { value: "AUD", label: "Australian Dollar (A$)" },
-  { value: "JPY", label: "Japanese Yen (¥)" },
-]
-
 const timezones = [
   { value: "America/New_York", label: "Eastern Time (ET)" },
   { value: "America/Chicago", label: "Central Time (CT)" },
@@ -123,7 +115,7 @@ export function PreferencesSettings({ user }: PreferencesSettingsProps) {
                 <SelectValue />
               </SelectTrigger>
               <SelectContent>
-                {currencies.map((currency) => (
+                {CURRENCIES.map((currency) => (
                   <SelectItem key={currency.value} value={currency.value}>
                     {currency.label}
                   </SelectItem>
@@ -1,6 +1,9 @@
 "use client"
 
+import { useQuery } from "@tanstack/react-query"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
+import { api } from "@/lib/api"
+import { formatCurrency, spentInUserCurrency } from "@/lib/currencies"
 import type { FuelReceipt } from "@/lib/types"
 import { DollarSign, TrendingUp, Gauge, Calendar } from "lucide-react"
 
@@ -9,8 +12,14 @@ interface StatsCardsProps {
 }
 
 export function StatsCards({ receipts }: StatsCardsProps) {
-  const totalSpent = receipts.reduce((sum, receipt) => sum + receipt.amount, 0)
-  const averagePerFillup = receipts.length > 0 ? totalSpent / receipts.length : 0
+  // Totals come from the server, converted into the user's currency
+  const { data: summary } = useQuery({
+    queryKey: ["fuel-receipts", "summary", null],
+    queryFn: () => api.getFuelReceiptSummary(),
+  })
+  const currency = summary?.currency ?? "USD"
+  const totalSpent = summary?.totalSpent ?? 0
+  const averagePerFillup = summary && summary.receipts > 0 ? totalSpent / summary.receipts : 0
   const lastOdometer = receipts.length > 0 ? Math.max(...receipts.map((r) => r.odometer)) : 0
   const firstOdometer = receipts.length > 0 ? Math.min(...receipts.map((r) => r.odometer)) : 0
   const totalDistance = lastOdometer - firstOdometer
@@ -22,7 +31,7 @@ export function StatsCards({ receipts }: StatsCardsProps) {
       const date = new Date(r.date)
       return date.getMonth() === thisMonth && date.getFullYear() === thisYear
     })
-    .reduce((sum, receipt) => sum + receipt.amount, 0)
+    .reduce((sum, receipt) => sum + spentInUserCurrency(receipt), 0)
 
   return (
     <div className="grid gap-4 md:grid-cols-2 lg:grid-cols-4">
@@ -32,8 +41,8 @@ export function StatsCards({ receipts }: StatsCardsProps) {
           <DollarSign className="h-4 w-4 text-muted-foreground" />
         </CardHeader>
         <CardContent>
-          <div className="text-2xl font-bold">${totalSpent.toFixed(2)}</div>
-          <p className="text-xs text-muted-foreground">Across {receipts.length} fill-ups</p>
+          <div className="text-2xl font-bold">{formatCurrency(totalSpent, currency)}</div>
+          <p className="text-xs text-muted-foreground">Across {summary?.receipts ?? 0} fill-ups</p>
         </CardContent>
       </Card>
 
@@ -43,7 +52,7 @@ export function StatsCards({ receipts }: StatsCardsProps) {
           <Calendar className="h-4 w-4 text-muted-foreground" />
         </CardHeader>
         <CardContent>
-          <div className="text-2xl font-bold">${thisMonthSpent.toFixed(2)}</div>
+          <div className="text-2xl font-bold">{formatCurrency(thisMonthSpent, currency)}</div>
           <p className="text-xs text-muted-foreground">Current month spending</p>
         </CardContent>
       </Card>
@@ -54,7 +63,7 @@ export function StatsCards({ receipts }: StatsCardsProps) {
           <TrendingUp className="h-4 w-4 text-muted-foreground" />
         </CardHeader>
         <CardContent>
-          <div className="text-2xl font-bold">${averagePerFillup.toFixed(2)}</div>
+          <div className="text-2xl font-bold">{formatCurrency(averagePerFillup, currency)}</div>
           <p className="text-xs text-muted-foreground">Average cost per visit</p>
         </CardContent>
       </Card>
@@ -0,0 +1,45 @@
+"use client"
+
+import { useEffect, useSyncExternalStore } from "react"
+import { useQueryClient } from "@tanstack/react-query"
+import { connectServerEvents, serverEventsConnection } from "@/lib/events"
+
+// Cached data changed elsewhere is invalidated by an event, so it needn't be refetched on every mount or focus
+const FRESH_FROM_EVENTS = { staleTime: 5 * 60 * 1000, refetchOnWindowFocus: false }
+
+// Keeps React Query caches fresh from server-sent events instead of polling
+export function useServerEvents() {
+  const queryClient = useQueryClient()
+  const seesAllEvents = useSyncExternalStore(
+    serverEventsConnection.subscribe,
+    serverEventsConnection.seesAllEvents,
+    () => false,
+  )
+
+  useEffect(() => {
+    // Without every worker's events (or while disconnected) changes can be missed, so fall back to refetching
+    queryClient.setDefaultOptions({ queries: seesAllEvents ? FRESH_FROM_EVENTS : {} })
+  }, [queryClient, seesAllEvents])
+
+  useEffect(() => {
+    return connectServerEvents(
+      (type) => {
+        if (type.startsWith("car.")) {
+          queryClient.invalidateQueries({ queryKey: ["cars"] })
+        }
+        if (type.startsWith("receipt.") || type === "car.deleted") {
+          queryClient.invalidateQueries({ queryKey: ["fuel-receipts"] })
+          queryClient.invalidateQueries({ queryKey: ["receipts"] })
+        }
+        if (type === "resync") {
+          queryClient.invalidateQueries()
+        }
+      },
+      () => queryClient.invalidateQueries(),
+    )
+  }, [queryClient])
+}
+
+export function useServerEventsConnected(): boolean {
+  return useSyncExternalStore(serverEventsConnection.subscribe, serverEventsConnection.isConnected, () => false)
+}
@@ -1,5 +1,6 @@
 import type {
   FuelReceipt,
+  FuelReceiptSummary,
   UploadResponse,
   Car,
   CreateCarRequest,
@@ -7,6 +8,7 @@ import type {
   ChangePasswordRequest,
 } from "./types"
 import { tokenManager } from "./auth"
+import { serverEventsConnection, waitForOcrJob } from "./events"
 
 // Configuration
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000"
@@ -14,6 +16,8 @@ const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000"
 // API client with error handling and authentication
 class ApiClient {
   private baseUrl: string
+  // Read-your-writes token: echoed back so reads right after a write skip the read replica
+  private primaryUntil: string | null = null
 
   constructor(baseUrl: string) {
     this.baseUrl = baseUrl
@@ -24,16 +28,18 @@ class ApiClient {
     const token = tokenManager.getToken()
 
     const config: RequestInit = {
+      ...options,
       headers: {
         "Content-Type": "application/json",
         ...(token && { Authorization: `Bearer ${token}` }),
+        ...(this.primaryUntil && { "X-Primary-Until": this.primaryUntil }),
         ...options.headers,
       },
-      ...options,
     }
 
     try {
       const response = await fetch(url, config)
+      this.primaryUntil = response.headers.get("X-Primary-Until") ?? this.primaryUntil
 
       // Handle 401 Unauthorized - token expired
       if (response.status === 401) {
@@ -104,16 +110,23 @@ class ApiClient {
     return this.request<FuelReceipt[]>(`/api/fuel-receipts${id ? `?car_id=${id}` : ""}`)
   }
 
+  async getFuelReceiptSummary(carId?: string): Promise<FuelReceiptSummary> {
+    return this.request<FuelReceiptSummary>(`/api/fuel-receipts/summary${carId ? `?car_id=${carId}` : ""}`)
+  }
+
   async getFuelReceipt(id: string): Promise<FuelReceipt> {
     return this.request<FuelReceipt>(`/api/fuel-receipts/${id}`)
   }
 
   async createFuelReceipt(
     receipt: Omit<FuelReceipt, "id" | "createdAt" | "updatedAt" | "userId">,
+    idempotencyKey?: string,
   ): Promise<FuelReceipt> {
     return this.request<FuelReceipt>("/api/fuel-receipts", {
       method: "POST",
       body: JSON.stringify(receipt),
+      // Retries with the same key replay the first response instead of saving a second receipt
+      headers: idempotencyKey ? { "Idempotency-Key": idempotencyKey } : undefined,
     })
   }
 
@@ -132,7 +145,17 @@ class ApiClient {
 
   // OCR endpoints
   async uploadReceiptForOCR(file: File): Promise<UploadResponse> {
-    return this.uploadFile<UploadResponse>("/api/fuel-receipts/upload", file)
+    const startedAt = Date.now()
+    let text: string
+    if (serverEventsConnection.seesAllEvents()) {
+      // Runs as a background job whose result arrives over the event stream, so no request is held open during OCR.
+      // The job may run on another API worker, so this needs a stream that gets every worker's events
+      const { jobId } = await this.uploadFile<{ jobId: string }>("/api/fuel-receipts/upload/jobs", file)
+      text = await waitForOcrJob(jobId)
+    } else {
+      text = (await this.uploadFile<{ text: string }>("/api/fuel-receipts/upload", file)).text
+    }
+    return { success: true, ocrResult: { rawText: text, processingTime: Date.now() - startedAt } }
   }
 
   // Car endpoints
@@ -199,6 +222,9 @@ export const api = {
   // Get all fuel receipts
   getFuelReceipts: (id?: string) => apiClient.getFuelReceipts(id),
 
+  // Spend and volume totals in the user's currency
+  getFuelReceiptSummary: (carId?: string) => apiClient.getFuelReceiptSummary(carId),
+
   // Get single fuel receipt
   getFuelReceipt: (id: string) => apiClient.getFuelReceipt(id),
 
@@ -206,8 +232,8 @@ export const api = {
   uploadReceipt: (file: File) => apiClient.uploadReceiptForOCR(file),
 
   // Save fuel receipt
-  saveFuelReceipt: (receipt: Omit<FuelReceipt, "id" | "createdAt" | "updatedAt" | "userId">) =>
-    apiClient.createFuelReceipt(receipt),
+  saveFuelReceipt: (receipt: Omit<FuelReceipt, "id" | "createdAt" | "updatedAt" | "userId">, idempotencyKey?: string) =>
+    apiClient.createFuelReceipt(receipt, idempotencyKey),
 
   // Update fuel receipt
   updateFuelReceipt: (id: string, updates: Partial<FuelReceipt>) => apiClient.updateFuelReceipt(id, updates),
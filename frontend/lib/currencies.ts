@@ -0,0 +1,21 @@
+import type { FuelReceipt } from "./types"
+
+// Currencies users and receipts can be in. Receipts in another currency than
+// the user's are converted with the rates in the backend's fx_rates table.
+export const CURRENCIES = [
+  { value: "USD", label: "US Dollar ($)" },
+  { value: "EUR", label: "Euro (€)" },
+  { value: "GBP", label: "British Pound (£)" },
+  { value: "CAD", label: "Canadian Dollar (C$)" },
+  { value: "AUD", label: "Australian Dollar (A$)" },
+  { value: "JPY", label: "Japanese Yen (¥)" },
+]
+
+export function formatCurrency(amount: number, currency: string): string {
+  return new Intl.NumberFormat(undefined, { style: "currency", currency }).format(amount)
+}
+
+// What a receipt cost in the user's currency (the server converts receipts paid in another one)
+export function spentInUserCurrency(receipt: FuelReceipt): number {
+  return receipt.amountPaidNormalized ?? receipt.amountPaid
+}
@@ -0,0 +1,178 @@
+import { tokenManager } from "./auth"
+
+// Configuration
+const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000"
+
+export type ServerEventType =
+  | "car.created"
+  | "car.updated"
+  | "car.deleted"
+  | "receipt.created"
+  | "receipt.updated"
+  | "receipt.deleted"
+  | "ocr.completed"
+  | "ocr.failed"
+  | "resync"
+
+const EVENT_TYPES: ServerEventType[] = [
+  "car.created",
+  "car.updated",
+  "car.deleted",
+  "receipt.created",
+  "receipt.updated",
+  "receipt.deleted",
+  "ocr.completed",
+  "ocr.failed",
+  "resync",
+]
+
+// Connection state shared by every component (read with useSyncExternalStore)
+let connected = false
+// Whether the stream gets events published by every API worker, not just the one it's connected to
+let crossWorker = false
+const connectionListeners = new Set<() => void>()
+
+function setConnected(value: boolean, reachesEveryWorker = false) {
+  if (connected === value && crossWorker === reachesEveryWorker) return
+  connected = value
+  crossWorker = reachesEveryWorker
+  connectionListeners.forEach((listener) => listener())
+}
+
+export const serverEventsConnection = {
+  subscribe(listener: () => void): () => void {
+    connectionListeners.add(listener)
+    return () => connectionListeners.delete(listener)
+  },
+  isConnected(): boolean {
+    return connected
+  },
+  // Only then do OCR job results and other tabs' changes reliably arrive over the stream
+  seesAllEvents(): boolean {
+    return connected && crossWorker
+  },
+}
+
+// Results of OCR upload jobs, delivered as ocr.completed / ocr.failed events
+const OCR_JOB_TIMEOUT_MS = 2 * 60 * 1000
+const pendingOcrJobs = new Map<string, { resolve: (text: string) => void; reject: (error: Error) => void }>()
+// Events that arrived before the job's POST returned its id
+const earlyOcrResults = new Map<string, { type: ServerEventType; data: any }>()
+
+function settleOcrJob(type: ServerEventType, data: any) {
+  const job = pendingOcrJobs.get(data.jobId)
+  if (!job) {
+    earlyOcrResults.set(data.jobId, { type, data })
+    // Results nobody waits for (jobs started in another tab) shouldn't pile up
+    if (earlyOcrResults.size > 20) earlyOcrResults.delete(earlyOcrResults.keys().next().value!)
+    return
+  }
+  pendingOcrJobs.delete(data.jobId)
+  if (type === "ocr.completed") job.resolve(data.text)
+  else job.reject(new Error(data.detail || "OCR failed"))
+}
+
+function failPendingOcrJobs() {
+  // Events sent while the stream is down are lost, so these results would never arrive
+  pendingOcrJobs.forEach((job) => job.reject(new Error("Lost connection while processing the receipt. Please try again.")))
+  pendingOcrJobs.clear()
+}
+
+// Resolves with the text of an upload job started with POST /api/fuel-receipts/upload/jobs
+export function waitForOcrJob(jobId: string): Promise<string> {
+  return new Promise((resolve, reject) => {
+    const timeout = setTimeout(() => {
+      pendingOcrJobs.delete(jobId)
+      reject(new Error("Receipt processing timed out. Please try again."))
+    }, OCR_JOB_TIMEOUT_MS)
+    pendingOcrJobs.set(jobId, {
+      resolve: (text) => {
+        clearTimeout(timeout)
+        resolve(text)
+      },
+      reject: (error) => {
+        clearTimeout(timeout)
+        reject(error)
+      },
+    })
+
+    const early = earlyOcrResults.get(jobId)
+    if (early) {
+      earlyOcrResults.delete(jobId)
+      settleOcrJob(early.type, early.data)
+    }
+  })
+}
+
+const RECONNECT_DELAY_MS = 5000
+
+// EventSource can't send headers, so the stream is opened with a short-lived,
+// single-use ticket rather than the access token, which would end up in logs
+async function fetchStreamTicket(): Promise<{ ticket: string; crossWorker: boolean } | null> {
+  const token = tokenManager.getToken()
+  if (!token) return null
+
+  const response = await fetch(`${API_BASE_URL}/api/events/ticket`, {
+    method: "POST",
+    headers: { Authorization: `Bearer ${token}` },
+  })
+  if (!response.ok) return null
+  return response.json()
+}
+
+// Opens the per-user event stream. `onReconnect` fires when the stream comes
+// back after an interruption, since events sent in the gap were missed.
+export function connectServerEvents(
+  onEvent: (type: ServerEventType, data: any) => void,
+  onReconnect: () => void,
+): () => void {
+  if (!tokenManager.getToken()) return () => {}
+
+  let source: EventSource | null = null
+  let retryTimer: ReturnType<typeof setTimeout> | undefined
+  let closed = false
+  let interrupted = false
+
+  const reconnectLater = () => {
+    setConnected(false)
+    failPendingOcrJobs()
+    interrupted = true
+    if (!closed) retryTimer = setTimeout(connect, RECONNECT_DELAY_MS)
+  }
+
+  async function connect() {
+    const ticket = await fetchStreamTicket().catch(() => null)
+    if (closed) return
+    if (!ticket) return reconnectLater()
+
+    source = new EventSource(`${API_BASE_URL}/api/events?ticket=${encodeURIComponent(ticket.ticket)}`)
+
+    source.onopen = () => {
+      setConnected(true, ticket.crossWorker)
+      if (interrupted) onReconnect()
+      interrupted = false
+    }
+    source.onerror = () => {
+      // EventSource would retry with the same ticket, which is already used
+      source?.close()
+      reconnectLater()
+    }
+
+    EVENT_TYPES.forEach((type) => {
+      source!.addEventListener(type, (event) => {
+        const data = JSON.parse((event as MessageEvent).data)
+        if (type === "ocr.completed" || type === "ocr.failed") settleOcrJob(type, data)
+        onEvent(type, data)
+      })
+    })
+  }
+
+  connect()
+
+  return () => {
+    closed = true
+    clearTimeout(retryTimer)
+    source?.close()
+    setConnected(false)
+  }
+}
@@ -5,6 +5,9 @@ export interface FuelReceipt {
   volumePurchased: number
   advertisedPrice: number
   odometer: number
+  currency?: string // ISO 4217 code the receipt was paid in; defaults to the user's currency
+  amountPaidNormalized?: number // amountPaid in the user's currency
+  advertisedPriceNormalized?: number // advertisedPrice in the user's currency
   imageUrl?: string
   userId: string // Add user association
   carId: string // Add car association
@@ -12,13 +15,20 @@ export interface FuelReceipt {
   updatedAt: string // ISO datetime string
 }
 
+export interface FuelReceiptSummary {
+  currency: string // the user's currency
+  receipts: number
+  totalSpent: number
+  totalVolume: number
+}
+
 export interface OCRResult {
   date?: string
   amountPaid?: number
   volumePurchased?: number
   advertisedPrice?: number
   odometer?: number
-  confidence: number
+  confidence?: number
   rawText?: string // Full OCR extracted text
   processingTime?: number // Time taken for OCR processing
 }
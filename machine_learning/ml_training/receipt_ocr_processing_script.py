@@ -32,6 +32,7 @@ def process_receipt(image_path, receipt_id):
 
     return {
         "id": receipt_id,
+        "image": os.path.basename(image_path),  # lets backend/benchmarks/ocr_eval.py find the image again
         "words": words,
         "bboxes": bboxes,
         "line_id": line_id,